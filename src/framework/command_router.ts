@@ -1,4 +1,4 @@
-import { Command, Response, isCommandSystem, isCommandUI, CommandUI, CommandSystem } from './types/commands'
+import { Command, Response, isCommandSystem, isCommandUI, isCommandBatch, CommandUI, CommandSystem, CommandBatch } from './types/commands'
 import { CommandHandler, System, VisualisationEngine } from './types/modules'
 
 export default class CommandRouter implements CommandHandler {
@@ -16,6 +16,8 @@ export default class CommandRouter implements CommandHandler {
         this.onCommandSystem(command, resolve)
       } else if (isCommandUI(command)) {
         this.onCommandUI(command, resolve)
+      } else if (isCommandBatch(command)) {
+        this.onCommandBatch(command, resolve)
       } else {
         reject(new TypeError('Unknown command' + JSON.stringify(command)))
       }
@@ -27,6 +29,17 @@ export default class CommandRouter implements CommandHandler {
     resolve({ __type__: 'Response', command, payload: { __type__: 'PayloadVoid', value: undefined } })
   }
 
+  onCommandBatch (batch: CommandBatch, resolve: (response: Response) => void): void {
+    batch.commands.filter(isCommandSystem).forEach((command) => this.system.send(command))
+
+    const command = batch.commands.find(isCommandUI)
+    if (command !== undefined) {
+      this.onCommandUI(command, resolve)
+    } else {
+      resolve({ __type__: 'Response', command: batch, payload: { __type__: 'PayloadVoid', value: undefined } })
+    }
+  }
+
   onCommandUI (command: CommandUI, reject: (reason?: any) => void): void {
     this.visualisationEngine.render(command).then(
       (response) => { reject(response) },
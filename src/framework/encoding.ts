@@ -0,0 +1,53 @@
+import { PropsUITableCell, PropsUITableRow } from './types/elements'
+
+// Decoding of the consent form tables, see port/encoding.py for the encodings
+
+export interface DataFrame {
+  columns: string[]
+  rows: PropsUITableRow[]
+}
+
+export function parseDataFrame (dataFrameJson: string, encoding?: string): DataFrame {
+  const dataFrame = JSON.parse(dataFrameJson)
+  if (encoding === 'columnar') {
+    return parseColumnarDataFrame(dataFrame)
+  }
+  return { columns: columnNames(dataFrame), rows: rows(dataFrame) }
+}
+
+function cell (value: any): PropsUITableCell {
+  return { __type__: 'PropsUITableCell', text: String(value) }
+}
+
+function columnNames (dataFrame: any): string[] {
+  return Object.keys(dataFrame)
+}
+
+function rowIds (dataFrame: any): string[] {
+  const columns = columnNames(dataFrame)
+  return columns.length === 0 ? [] : Object.keys(dataFrame[columns[0]])
+}
+
+function rows (dataFrame: any): PropsUITableRow[] {
+  return rowIds(dataFrame).map((id): PropsUITableRow => {
+    const cells = columnNames(dataFrame).map((column: string) => cell(dataFrame[column][id]))
+    return { __type__: 'PropsUITableRow', id, cells }
+  })
+}
+
+function parseColumnarDataFrame ({ index, columns }: any): DataFrame {
+  const values: any[][] = columns.map((column: any) => columnValues(column))
+  const tableRows = index.map((id: any, row: number): PropsUITableRow => {
+    const cells = values.map((column) => cell(column[row]))
+    return { __type__: 'PropsUITableRow', id: String(id), cells }
+  })
+  return { columns: columns.map((column: any) => column.name), rows: tableRows }
+}
+
+function columnValues ({ values, dictionary, codes }: any): any[] {
+  if (values !== undefined) {
+    return values
+  }
+  // Dictionary encoded column, code -1 is a missing value
+  return codes.map((code: number) => code === -1 ? null : dictionary[code])
+}
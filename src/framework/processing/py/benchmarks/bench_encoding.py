@@ -0,0 +1,83 @@
+"""
+Compare the wire formats for consent form tables
+
+Usage: python benchmarks/bench_encoding.py [--rows 1000 10000 100000]
+
+Reports the encoded size and encode time of a synthetic watch history
+table for every encoding in port.encoding. Arrow IPC is reported for
+reference when pyarrow is installed, it is not offered to the UI.
+"""
+import argparse
+import base64
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# port is imported from the package root, also when the script is run as benchmarks/bench_encoding.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from port.encoding import ENCODINGS, encode  # noqa: E402
+
+REPEAT = 5
+
+
+def watch_history(rows, channels=200, seed=0):
+    rng = np.random.default_rng(seed)
+    channel = rng.integers(0, channels, rows)
+    video = rng.integers(0, rows, rows)
+    return pd.DataFrame({
+        "title": [f"Watched Video number {v}" for v in video],
+        "titleUrl": [f"https://www.youtube.com/watch?v={v:011d}" for v in video],
+        "channel": [f"Channel {c}" for c in channel],
+        "channelUrl": [f"https://www.youtube.com/channel/UC{c:022d}" for c in channel],
+        "time": pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, rows), unit="s"),
+    })
+
+
+def encode_arrow(frame):
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+
+
+def measure(fun, frame):
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        out = fun(frame)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(out.encode("utf-8")), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    encoders = [(encoding, lambda frame, encoding=encoding: encode(frame, encoding)) for encoding in ENCODINGS]
+    try:
+        import pyarrow  # noqa: F401
+        encoders.append(("arrow (base64)", encode_arrow))
+    except ImportError:
+        pass
+
+    print(f"{'rows':>8}  {'encoding':<16}{'bytes':>14}{'ratio':>8}{'encode ms':>12}")
+    for rows in args.rows:
+        frame = watch_history(rows)
+        baseline = None
+        for name, fun in encoders:
+            size, elapsed = measure(fun, frame)
+            baseline = baseline or size
+            print(f"{rows:>8}  {name:<16}{size:>14,}{size / baseline:>8.2f}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark the extraction paths of the donation flow on synthetic DDPs
+
+Usage: python benchmarks/bench_extraction.py [--entries 1000 10000 100000] [--platform youtube]
+                                              [--output results.jsonl]
+
+Every platform is benchmarked on a DDP generated by synthetic_ddp, YouTube
+in every language and filetype. Each case is split in the phases of the
+flow:
+
+    extract  the platform's extract function on the DDP, compacting and redacting the tables
+    render   the consent form command serialized with toDict
+    donate   resolving the accepted consent and serializing the donations
+
+and for every phase the wall time, the peak of traced memory (tracemalloc,
+measured in a separate run as tracing slows everything down) and the
+serialized size are reported. With --output the results are appended as
+JSON lines, so that they can be compared over time.
+"""
+import argparse
+import datetime
+import importlib
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import synthetic_ddp
+
+# port is imported from the package root, also when the script is run as benchmarks/bench_extraction.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from port import script  # noqa: E402
+from port.consent import TablePager  # noqa: E402
+from port.donation import donate  # noqa: E402
+from port.platforms import PLATFORMS  # noqa: E402
+from port.zipindex import ZipIndex  # noqa: E402
+
+EXTRACTORS = {platform.name.lower(): platform for platform in PLATFORMS}
+
+PHASES = ("extract", "render", "donate")
+
+
+def cases(platforms, entries):
+    for platform in platforms:
+        variants = [
+            (language, filetype) for language in synthetic_ddp.LANGUAGES for filetype in synthetic_ddp.FILETYPES
+        ]
+        if platform != "youtube":
+            variants = [("en", "json")]
+        for count in entries:
+            for language, filetype in variants:
+                yield platform, count, language, filetype
+
+
+def accept_all(consent_form):
+    consent = [{table.id: {"deleted": []}} for table in consent_form.tables + consent_form.meta_tables]
+    return json.dumps(consent)
+
+
+def run_phases(platform, path, measure):
+    """Run the phases of the flow on the DDP at path, measure(phase, fun) returns the result of fun"""
+    platform_name = EXTRACTORS[platform].name
+    with ZipIndex(path) as ddp:
+        validation, result = measure("extract", lambda: EXTRACTORS[platform].extract(ddp))
+
+        def render():
+            prompt, sources = script.prompt_consent(platform_name, result)
+            command = script.render_donation_page(platform_name, prompt, 0)
+            return prompt, sources, json.dumps(command.toDict("en"))
+
+        prompt, sources, wire = measure("render", render)
+
+        def donation():
+            pager = TablePager(prompt, sources)
+            return "".join(
+                command.toDict()["json_string"]
+                for command in donate(platform_name, pager.fragments(accept_all(prompt)))
+            )
+
+        donated = measure("donate", donation)
+
+    rows = sum(table.total_rows() for table in prompt.tables)
+    return rows, {"render": len(wire), "donate": len(donated)}
+
+
+def benchmark(platform, path):
+    metrics = {phase: {} for phase in PHASES}
+
+    def timed(phase, fun):
+        start = time.perf_counter()
+        value = fun()
+        metrics[phase]["seconds"] = time.perf_counter() - start
+        return value
+
+    def traced(phase, fun):
+        tracemalloc.start()
+        try:
+            return fun()
+        finally:
+            metrics[phase]["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    rows, sizes = run_phases(platform, path, timed)
+    run_phases(platform, path, traced)
+    for phase, size in sizes.items():
+        metrics[phase]["serialized_bytes"] = size
+    return rows, metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--platform", choices=EXTRACTORS, action="append", dest="platforms")
+    parser.add_argument("--output", type=Path, help="append the results as JSON lines to this file")
+    args = parser.parse_args()
+
+    # the platform modules are imported on first use, that is not what is measured here
+    for module in ["port.compact", "port.redact"] + [platform.module for platform in PLATFORMS]:
+        importlib.import_module(module)
+
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    print(f"{'platform':<10}{'entries':>9} {'variant':<9}{'ddp bytes':>12}{'rows':>9}  "
+          f"{'phase':<8}{'ms':>10}{'peak MiB':>10}{'bytes':>14}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for platform, entries, language, filetype in cases(args.platforms or list(EXTRACTORS), args.entries):
+            path = synthetic_ddp.generate(Path(tmp) / "ddp.zip", platform, entries, language, filetype)
+            ddp_bytes = path.stat().st_size
+            rows, metrics = benchmark(platform, path)
+
+            for phase in PHASES:
+                metric = metrics[phase]
+                print(f"{platform:<10}{entries:>9} {language + '/' + filetype:<9}{ddp_bytes:>12,}{rows:>9}  "
+                      f"{phase:<8}{metric['seconds'] * 1000:>10.1f}{metric['peak_bytes'] / 2 ** 20:>10.1f}"
+                      f"{metric.get('serialized_bytes', 0):>14,}")
+
+            if args.output is not None:
+                with open(args.output, "a", encoding="utf-8") as output:
+                    output.write(json.dumps({
+                        "timestamp": timestamp,
+                        "platform": platform,
+                        "entries": entries,
+                        "language": language,
+                        "filetype": filetype,
+                        "ddp_bytes": ddp_bytes,
+                        "rows": rows,
+                        "phases": metrics,
+                    }) + "\n")
+
+
+if __name__ == "__main__":
+    main()
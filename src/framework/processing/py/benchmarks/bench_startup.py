@@ -0,0 +1,61 @@
+"""
+Measure the time to the first rendered page
+
+Usage: python benchmarks/bench_startup.py [--repeat 5]
+
+Every run starts a fresh interpreter that does what py_worker.js does on
+start: import port, start a session and send until the first
+CommandUIRender, on its own or in a CommandBatch. Reported are the import
+time, the time to the first render and which of the heavy modules were
+loaded by then.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+HEAVY_MODULES = ("pandas", "numpy", "ddpinspect", "bs4", "lxml")
+
+# the runs import port from the package root, also when the script is run as benchmarks/bench_startup.py
+ROOT = Path(__file__).resolve().parent.parent
+
+RUN = """
+import json, sys, time
+start = time.perf_counter()
+import port
+imported = time.perf_counter()
+wrapper = port.start(0)
+command = wrapper.send(None)
+while "CommandUIRender" not in [c["__type__"] for c in command.get("commands", [command])]:
+    command = wrapper.send(None)
+rendered = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_render": rendered - start,
+    "loaded": [module for module in %r if module in sys.modules],
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(args.repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", RUN % (HEAVY_MODULES,)], cwd=ROOT, check=True, capture_output=True, text=True
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    import_ms = statistics.median(run["import"] for run in runs) * 1000
+    print(f"import port      {import_ms:>8.1f} ms (median of {len(runs)})")
+    print(f"first render     {statistics.median(run['first_render'] for run in runs) * 1000:>8.1f} ms")
+    print(f"modules loaded   {', '.join(runs[-1]['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Generate synthetic DDPs in the layout of the real platform exports
+
+Usage: python benchmarks/synthetic_ddp.py OUT_DIR [--platform youtube] [--entries 1000]
+                                                 [--language en] [--filetype json] [--count 1]
+
+entries is the number of watch history entries for YouTube and the number
+of interests and topics for the other platforms. The archives can be fed
+to tools/run_batch.py, benchmarks/bench_extraction.py generates its own.
+"""
+import argparse
+import datetime
+import json
+import random
+import zipfile
+from pathlib import Path
+
+LANGUAGES = ("en", "nl")
+FILETYPES = ("json", "html")
+
+WORDS = (
+    "music", "live", "official", "video", "review", "tutorial", "how", "to", "best", "of", "news", "football",
+    "cooking", "recipe", "travel", "vlog", "gaming", "highlights", "podcast", "interview", "trailer", "science",
+    "history", "documentary", "comedy", "sketch", "dutch", "english", "remix", "cover", "acoustic", "unboxing",
+)
+
+START = datetime.datetime(2018, 1, 1, tzinfo=datetime.timezone.utc)
+SPAN = 5 * 365 * 24 * 3600
+
+YOUTUBE_FILES = {
+    "en": {
+        "root": "Takeout/YouTube and YouTube Music",
+        "watch_history": "history/watch-history",
+        "subscriptions": "subscriptions/subscriptions.csv",
+        "subscriptions_header": "Channel Id,Channel Url,Channel Title",
+        "comments": "my-comments/my-comments.html",
+        "watched": "Watched",
+    },
+    "nl": {
+        "root": "Takeout/YouTube en YouTube Music",
+        "watch_history": "geschiedenis/kijkgeschiedenis",
+        "subscriptions": "abonnementen/abonnementen.csv",
+        "subscriptions_header": "Kanaal-ID,Kanaal-URL,Kanaaltitels",
+        "comments": "mijn-reacties/mijn-reacties.html",
+        "watched": "Bekeken",
+    },
+}
+
+MONTHS = {
+    "en": ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+    "nl": ("jan", "feb", "mrt", "apr", "mei", "jun", "jul", "aug", "sep", "okt", "nov", "dec"),
+}
+
+HTML_HEAD = '<html><head><meta charset="utf-8"><title>{title}</title></head><body><div class="mdl-grid">'
+HTML_TAIL = "</div></body></html>"
+
+
+def _title(rng, words=5):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, words))).capitalize()
+
+
+def _time(rng):
+    return START + datetime.timedelta(seconds=rng.randrange(SPAN))
+
+
+def _video_id(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_") for _ in range(11))
+
+
+def _channels(rng, count):
+    return [(f"UC{rng.getrandbits(96):024x}", _title(rng, 3)) for _ in range(count)]
+
+
+def _html_time(time, language):
+    month = MONTHS[language][time.month - 1]
+    if language == "en":
+        return f"{month} {time.day}, {time.year}, {time.strftime('%I:%M:%S %p')} UTC"
+    return f"{time.day} {month} {time.year}, {time.strftime('%H:%M:%S')} UTC"
+
+
+def youtube(entries, language="en", filetype="json", seed=0):
+    """Google Takeout of YouTube with entries watch history entries, returns {path: content}"""
+    rng = random.Random(seed)
+    files = YOUTUBE_FILES[language]
+    channels = _channels(rng, max(1, min(entries // 20, 2000)))
+    times = sorted((_time(rng) for _ in range(entries)), reverse=True)
+
+    history = []
+    for time in times:
+        channel_id, channel = rng.choice(channels)
+        history.append((_video_id(rng), _title(rng), channel_id, channel, time))
+
+    content = {}
+    if filetype == "json":
+        content[f"{files['watch_history']}.json"] = json.dumps([
+            {
+                "header": "YouTube",
+                "title": f"{files['watched']} {title}",
+                "titleUrl": f"https://www.youtube.com/watch?v={video_id}",
+                "subtitles": [{"name": channel, "url": f"https://www.youtube.com/channel/{channel_id}"}],
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+                "products": ["YouTube"],
+                "activityControls": ["YouTube watch history"],
+            }
+            for video_id, title, channel_id, channel, time in history
+        ], indent=2)
+    else:
+        cells = [HTML_HEAD.format(title=files["watched"])]
+        for video_id, title, channel_id, channel, time in history:
+            cells.append(
+                '<div class="outer-cell mdl-cell mdl-cell--12-col mdl-shadow--2dp"><div class="mdl-grid">'
+                '<div class="header-cell mdl-cell mdl-cell--12-col">'
+                '<p class="mdl-typography--title">YouTube<br></p></div>'
+                '<div class="content-cell mdl-cell mdl-cell--6-col mdl-typography--body-1">'
+                f'{files["watched"]}\xa0<a href="https://www.youtube.com/watch?v={video_id}">{title}</a><br>'
+                f'<a href="https://www.youtube.com/channel/{channel_id}">{channel}</a><br>'
+                f'{_html_time(time, language)}</div></div></div>'
+            )
+        cells.append(HTML_TAIL)
+        content[f"{files['watch_history']}.html"] = "".join(cells)
+
+    subscribed = rng.sample(channels, max(1, len(channels) // 4))
+    content[files["subscriptions"]] = "\n".join(
+        [files["subscriptions_header"]]
+        + [f"{channel_id},http://www.youtube.com/channel/{channel_id},{channel}" for channel_id, channel in subscribed]
+    ) + "\n"
+
+    comments = [HTML_HEAD.format(title="Comments"), "<ul>"]
+    for video_id, title, _, _, time in rng.sample(history, min(len(history), max(1, entries // 100))):
+        comments.append(
+            f'<li>You added a <a href="https://www.youtube.com/watch?v={video_id}&amp;lc=Ug{rng.getrandbits(64):016x}">'
+            f'comment</a> on <a href="https://www.youtube.com/watch?v={video_id}">{title}</a>.<br/>'
+            f"{time.strftime('%Y-%m-%d %H:%M:%S')} UTC<br/>{_title(rng, 12)}</li>"
+        )
+    comments.append("</ul>" + HTML_TAIL)
+    content[files["comments"]] = "".join(comments)
+
+    return {f"{files['root']}/{path}": data for path, data in content.items()}
+
+
+def twitter(entries, language="en", filetype="json", seed=0):
+    """Twitter archive with entries interests, returns {path: content}"""
+    rng = random.Random(seed)
+    interests = [{"name": _title(rng, 3), "isDisabled": rng.random() < 0.1} for _ in range(entries)]
+    personalization = [{
+        "p13nData": {
+            "demographics": {
+                "languages": [{"language": "Dutch" if language == "nl" else "English", "isDisabled": False}]
+            },
+            "interests": {"interests": interests, "partnerInterests": [], "audienceAndAdvertisers": {}, "shows": []},
+            "locationHistory": [],
+        }
+    }]
+    account = [{
+        "account": {
+            "email": "participant@example.com",
+            "createdVia": "web",
+            "username": "participant",
+            "accountId": str(rng.getrandbits(60)),
+            "createdAt": _time(rng).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "accountDisplayName": "Participant",
+        }
+    }]
+    return {
+        "data/personalization.js": "window.YTD.personalization.part0 = " + json.dumps(personalization, indent=2),
+        "data/account.js": "window.YTD.account.part0 = " + json.dumps(account, indent=2),
+    }
+
+
+def instagram(entries, language="en", filetype="json", seed=0):
+    """Instagram export with entries interests and topics, returns {path: content}"""
+    rng = random.Random(seed)
+    interest = "Interesse" if language == "nl" else "Interest"
+    name = "Naam" if language == "nl" else "Name"
+    return {
+        "information_about_you/ads_interests.json": json.dumps({
+            "inferred_data_ig_interest": [
+                {
+                    "media_map_data": {},
+                    "string_map_data": {interest: {"href": "", "value": _title(rng, 3), "timestamp": 0}},
+                }
+                for _ in range(entries)
+            ]
+        }, indent=2),
+        "your_topics/your_topics.json": json.dumps({
+            "topics_your_topics": [
+                {"media_map_data": {}, "string_map_data": {name: {"href": "", "value": _title(rng, 3), "timestamp": 0}}}
+                for _ in range(entries)
+            ]
+        }, indent=2),
+        "account_information/signup_information.json": json.dumps({
+            "account_history_registration_info": [{
+                "title": "",
+                "media_map_data": {},
+                "string_map_data": {"Time": {"href": "", "value": "", "timestamp": int(_time(rng).timestamp())}},
+            }]
+        }, indent=2),
+    }
+
+
+def facebook(entries, language="en", filetype="json", seed=0):
+    """Facebook export with entries interests and topics, returns {path: content}"""
+    rng = random.Random(seed)
+    return {
+        "other_logged_information/ads_interests.json": json.dumps(
+            {"topics_v2": [_title(rng, 3) for _ in range(entries)]}, indent=2
+        ),
+        "your_topics/your_topics.json": json.dumps(
+            {"inferred_topics_v2": [_title(rng, 3) for _ in range(entries)]}, indent=2
+        ),
+        "profile_information/profile_information.json": json.dumps({
+            "profile_v2": {
+                "name": {"full_name": "Participant", "first_name": "Participant", "middle_name": "", "last_name": ""},
+                "registration_timestamp": int(_time(rng).timestamp()),
+            }
+        }, indent=2),
+    }
+
+
+PLATFORMS = {
+    "twitter": twitter,
+    "instagram": instagram,
+    "facebook": facebook,
+    "youtube": youtube,
+}
+
+
+def write_zip(path, content):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as ddp:
+        for name, data in content.items():
+            ddp.writestr(name, data)
+    return path
+
+
+def generate(path, platform, entries, language="en", filetype="json", seed=0):
+    """Write a synthetic DDP of platform to path"""
+    return write_zip(path, PLATFORMS[platform](entries, language, filetype, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--platform", choices=PLATFORMS, default="youtube")
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--language", choices=LANGUAGES, default="en")
+    parser.add_argument("--filetype", choices=FILETYPES, default="json")
+    parser.add_argument("--count", type=int, default=1, help="number of archives, each with its own seed")
+    args = parser.parse_args()
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    for seed in range(args.count):
+        name = f"{args.platform}-{args.language}-{args.filetype}-{args.entries}-{seed}.zip"
+        path = generate(args.out_dir / name, args.platform, args.entries, args.language, args.filetype, seed)
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
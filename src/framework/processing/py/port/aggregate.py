@@ -0,0 +1,139 @@
+"""
+Aggregates of the YouTube watch history, computed on the device
+
+Many studies only need how often channels were watched, not every view.
+The aggregates are computed with groupby over the watch history table and
+are orders of magnitude smaller to render and to donate. They are computed
+from the full watch history, never from a preview of it, which would show
+wrong counts. Both the table of
+the HTML history (Channel, Date) and that of the JSON history (subtitles,
+time) are understood, English and Dutch dates of the HTML history included.
+Views of which the date cannot be parsed are left out of the aggregates
+per period.
+"""
+import pandas as pd
+
+ISO_SECONDS = "%Y-%m-%dT%H:%M:%S"
+
+# Localized dates of the HTML history: "Jan 5, 2023, 10:15:30 AM CET" and "5 jan 2023, 10:15:30 CET"
+CLOCK = r"(?P<hour>\d{1,2}):(?P<minute>\d{2}):(?P<second>\d{2})"
+EN_DATE = r"^(?P<month>[A-Za-z]{3})[a-z]*\.? (?P<day>\d{1,2}), (?P<year>\d{4}),? " + CLOCK + r"\s?(?P<ampm>[AaPp])"
+NL_DATE = r"^(?P<day>\d{1,2}) (?P<month>[A-Za-z]{3})[a-z]*\.? (?P<year>\d{4}),? " + CLOCK
+
+# Abbreviated month names in English and Dutch
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "mrt": 3, "apr": 4, "may": 5, "mei": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "okt": 10, "nov": 11, "dec": 12,
+}
+
+
+def channels(frame):
+    """Channel of every view, the first subtitle of a view in the JSON history"""
+    if "Channel" in frame:
+        return frame["Channel"]
+    if "subtitles" in frame:
+        return frame["subtitles"].str[0].str.get("name")
+    return pd.Series(None, index=frame.index, dtype=object)
+
+
+def timestamps(frame):
+    """
+    Timestamp of every view, NaT where it is missing or cannot be parsed
+
+    The timestamps of the JSON history are in UTC. The localized dates of
+    the HTML history are in the time zone of the participant, of which only
+    an abbreviation is given: they are kept in local time.
+    """
+    for name in ("Date", "time"):
+        if name in frame:
+            column = frame[name]
+            if isinstance(column.dtype, pd.DatetimeTZDtype):
+                # compacted already, see port.compact
+                return column
+            text = column.astype(str)
+            # only the date and time up to the seconds are parsed
+            seconds = text.str.slice(0, 19).str.replace(" ", "T", regex=False)
+            out = pd.to_datetime(seconds, format=ISO_SECONDS, utc=True, errors="coerce")
+            if out.isna().all():
+                out = localized_timestamps(text)
+            return out
+    return pd.Series(pd.NaT, index=frame.index, dtype="datetime64[ns, UTC]")
+
+
+def localized_timestamps(text):
+    """Timestamps of the localized dates of the HTML history (see EN_DATE, NL_DATE), NaT where they do not match"""
+    parts = text.str.extract(EN_DATE)
+    dutch = text.str.extract(NL_DATE)
+    for name in dutch.columns:
+        parts[name] = parts[name].fillna(dutch[name])
+
+    numbers = parts[["year", "day", "hour", "minute", "second"]].apply(pd.to_numeric)
+    # 12 AM is midnight, 12 PM noon
+    ampm = parts["ampm"].str.upper()
+    hours = numbers["hour"].where(ampm.isna(), numbers["hour"] % 12 + (ampm == "P") * 12)
+    return pd.to_datetime(pd.DataFrame({
+        "year": numbers["year"],
+        "month": parts["month"].str.lower().map(MONTHS),
+        "day": numbers["day"],
+        "hour": hours,
+        "minute": numbers["minute"],
+        "second": numbers["second"],
+    }), utc=True, errors="coerce")
+
+
+def views_per_channel(frame):
+    """Number of views per channel, most watched first"""
+    keys = pd.DataFrame({"Channel": channels(frame)})
+    out = keys.groupby("Channel", observed=True).size().reset_index(name="Views")
+    return out.sort_values("Views", ascending=False, kind="stable", ignore_index=True)
+
+
+def views_per_channel_per_day(frame):
+    """Number of views per channel per day, see timestamps()"""
+    return _views_per_period(frame, "Day", timestamps(frame).dt.floor("D"))
+
+
+def views_per_channel_per_week(frame):
+    """Number of views per channel per week, weeks start on Monday"""
+    days = timestamps(frame).dt.floor("D")
+    return _views_per_period(frame, "Week", days - pd.to_timedelta(days.dt.dayofweek, unit="D"))
+
+
+def _views_per_period(frame, period, starts):
+    keys = pd.DataFrame({"Channel": channels(frame), period: starts})
+    out = keys.groupby(["Channel", period], observed=True).size().reset_index(name="Views")
+    # only the date of the start of the period is shown and donated
+    out[period] = out[period].dt.strftime("%Y-%m-%d")
+    return out
+
+
+# Aggregates that can be offered, by name
+VIEWS = {
+    "per_channel": views_per_channel,
+    "per_channel_per_day": views_per_channel_per_day,
+    "per_channel_per_week": views_per_channel_per_week,
+}
+
+
+def has_timestamps(frame):
+    """Whether the views of frame have timestamps, the aggregates per period are empty otherwise"""
+    return bool(timestamps(frame).notna().any())
+
+
+# Aggregates per period, left out when the dates of the views cannot be parsed
+PERIOD_VIEWS = ("per_channel_per_day", "per_channel_per_week")
+
+
+def of_table(table, names):
+    """
+    Aggregates in names (see VIEWS) of a lazy watch history table, by name
+
+    The aggregates are small, they are computed from the full table before
+    the consent form is shown. frame() builds the table once and keeps it
+    for donating the views.
+    """
+    if not names:
+        return {}
+    frame = table.frame()
+    dated = has_timestamps(frame)
+    return {name: VIEWS[name](frame) for name in names if dated or name not in PERIOD_VIEWS}
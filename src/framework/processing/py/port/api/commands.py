@@ -1,26 +1,48 @@
-class CommandUIRender:
+from port.api.serialization import Serializable
+from port.encoding import DEFAULT_ENCODING, encode
+
+
+class CommandUIRender(Serializable):
     __slots__ = "page"
 
     def __init__(self, page):
         self.page = page
 
-    def toDict(self):
+
+class CommandUITablePage(Serializable):
+    __slots__ = "id", "page", "match_count", "data_frame", "encoding"
+
+    def __init__(self, id, page, match_count, data_frame, encoding=DEFAULT_ENCODING):
+        self.id = id
+        self.page = page
+        self.match_count = match_count
+        self.data_frame = data_frame
+        self.encoding = encoding
+
+    def _to_wire(self, locale):
         dict = {}
-        dict["__type__"] = "CommandUIRender"
-        dict["page"] = self.page.toDict()
+        dict["__type__"] = "CommandUITablePage"
+        dict["id"] = self.id
+        dict["page"] = self.page
+        dict["matchCount"] = self.match_count
+        dict["encoding"] = self.encoding
+        dict["data_frame"] = encode(self.data_frame, self.encoding)
         return dict
 
 
-class CommandSystemDonate:
+class CommandSystemDonate(Serializable):
     __slots__ = "key", "json_string"
+    __wire_names__ = {"json_string": "json_string"}
 
     def __init__(self, key, json_string):
         self.key = key
         self.json_string = json_string
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "CommandSystemDonate"
-        dict["key"] = self.key
-        dict["json_string"] = self.json_string
-        return dict
+
+class CommandBatch(Serializable):
+    """System commands followed by at most one UI command, answered with the response to that UI command"""
+
+    __slots__ = "commands"
+
+    def __init__(self, commands):
+        self.commands = commands
@@ -1,30 +1,22 @@
-class PropsUIHeader:
+from port.api.serialization import Immutable, Serializable, serialize
+from port.encoding import DEFAULT_ENCODING, encode
+
+
+class PropsUIHeader(Immutable):
     __slots__ = "title"
 
     def __init__(self, title):
         self.title = title
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIHeader"
-        dict["title"] = self.title.toDict()
-        return dict
-
 
-class PropsUIFooter:
+class PropsUIFooter(Serializable):
     __slots__ = "progress_percentage"
 
     def __init__(self, progress_percentage):
         self.progress_percentage = progress_percentage
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIFooter"
-        dict["progressPercentage"] = self.progress_percentage
-        return dict
 
-
-class PropsUIPromptConfirm:
+class PropsUIPromptConfirm(Serializable):
     __slots__ = "text", "ok", "cancel"
 
     def __init__(self, text, ok, cancel):
@@ -32,75 +24,72 @@ class PropsUIPromptConfirm:
         self.ok = ok
         self.cancel = cancel
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIPromptConfirm"
-        dict["text"] = self.text.toDict()
-        dict["ok"] = self.ok.toDict()
-        dict["cancel"] = self.cancel.toDict()
-        return dict
-
 
-class PropsUIPromptConsentForm:
+class PropsUIPromptConsentForm(Serializable):
     __slots__ = "tables", "meta_tables"
 
     def __init__(self, tables, meta_tables):
         self.tables = tables
         self.meta_tables = meta_tables
 
-    def translate_tables(self):
-        output = []
-        for table in self.tables:
-            output.append(table.toDict())
-        return output
-
-    def translate_meta_tables(self):
-        output = []
-        for table in self.meta_tables:
-            output.append(table.toDict())
-        return output
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIPromptConsentForm"
-        dict["tables"] = self.translate_tables()
-        dict["metaTables"] = self.translate_meta_tables()
-        return dict
+class PropsUIPromptConsentFormTable(Serializable):
+    __slots__ = "id", "title", "data_frame", "page_size", "encoding", "row_count"
 
-
-class PropsUIPromptConsentFormTable:
-    __slots__ = "id", "title", "data_frame"
-
-    def __init__(self, id, title, data_frame):
+    def __init__(self, id, title, data_frame, page_size=None, encoding=DEFAULT_ENCODING, row_count=None):
         self.id = id
         self.title = title
         self.data_frame = data_frame
+        self.page_size = page_size
+        self.encoding = encoding
+        # number of rows of the full table when data_frame only holds a preview of it
+        self.row_count = row_count
+
+    def total_rows(self):
+        return len(self.data_frame) if self.row_count is None else self.row_count
+
+    def is_paged(self):
+        return self.page_size is not None and self.total_rows() > self.page_size
 
-    def toDict(self):
+    def _to_wire(self, locale):
         dict = {}
         dict["__type__"] = "PropsUIPromptConsentFormTable"
         dict["id"] = self.id
-        dict["title"] = self.title.toDict()
-        dict["data_frame"] = self.data_frame.to_json()
+        dict["title"] = serialize(self.title, locale)
+        dict["encoding"] = self.encoding
+        if self.is_paged():
+            # only the first page, the rest is requested on demand with row positions as ids
+            page = self.data_frame.iloc[:self.page_size]
+            dict["data_frame"] = encode(page.set_axis(range(len(page)), axis=0), self.encoding)
+            dict["rowCount"] = self.total_rows()
+            dict["pageSize"] = self.page_size
+        else:
+            # row positions as ids, the consent form sends back the positions of the deleted rows
+            frame = self.data_frame
+            dict["data_frame"] = encode(frame.set_axis(range(len(frame)), axis=0), self.encoding)
         return dict
 
 
-class PropsUIPromptFileInput:
+class PropsUIPromptFileInput(Serializable):
     __slots__ = "description", "extensions"
 
     def __init__(self, description, extensions):
         self.description = description
         self.extensions = extensions
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIPromptFileInput"
-        dict["description"] = self.description.toDict()
-        dict["extensions"] = self.extensions
-        return dict
 
+class PropsUIPromptProgress(Serializable):
+    """Progress of a long running step, resolved by the UI as soon as it is shown or when it is cancelled"""
+
+    __slots__ = "description", "percentage", "cancel"
 
-class PropsUIPromptRadioInput:
+    def __init__(self, description, percentage, cancel):
+        self.description = description
+        self.percentage = percentage
+        self.cancel = cancel
+
+
+class PropsUIPromptRadioInput(Serializable):
     __slots__ = "title", "description", "items"
 
     def __init__(self, title, description, items):
@@ -108,16 +97,8 @@ class PropsUIPromptRadioInput:
         self.description = description
         self.items = items
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIPromptRadioInput"
-        dict["title"] = self.title.toDict()
-        dict["description"] = self.description.toDict()
-        dict["items"] = self.items
-        return dict
-
 
-class PropsUIPageDonation:
+class PropsUIPageDonation(Serializable):
     __slots__ = "platform", "header", "body", "footer"
 
     def __init__(self, platform, header, body, footer):
@@ -126,30 +107,25 @@ class PropsUIPageDonation:
         self.body = body
         self.footer = footer
 
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIPageDonation"
-        dict["platform"] = self.platform
-        dict["header"] = self.header.toDict()
-        dict["body"] = self.body.toDict()
-        dict["footer"] = self.footer.toDict()
-        return dict
 
+class PropsUIPageEnd(Serializable):
+    __slots__ = ()
 
-class PropsUIPageEnd:
-    def toDict(self):
-        dict = {}
-        dict["__type__"] = "PropsUIPageEnd"
-        return dict
 
-
-class Translatable:
+class Translatable(Immutable):
     __slots__ = "translations"
 
+    # Locale the UI falls back to, see translator.ts
+    default_locale = "nl"
+
     def __init__(self, translations):
         self.translations = translations
 
-    def toDict(self):
-        dict = {}
-        dict["translations"] = self.translations
-        return dict
+    def _to_wire(self, locale):
+        if locale is None:
+            return {"translations": self.translations}
+        # a plain string is a valid Text in the UI
+        text = self.translations.get(locale, self.translations.get(self.default_locale))
+        if text is None:
+            text = next(iter(self.translations.values()), "?text?")
+        return text
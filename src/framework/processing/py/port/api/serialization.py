@@ -0,0 +1,69 @@
+_FIELDS = {}
+
+
+def serialize(value, locale=None):
+    if isinstance(value, Serializable):
+        return value.toDict(locale)
+    if isinstance(value, (list, tuple)):
+        return [serialize(item, locale) for item in value]
+    return value
+
+
+def _camel_case(name):
+    head, *tail = name.split("_")
+    return head + "".join(part.title() for part in tail)
+
+
+def _fields(cls):
+    """(slot, wire name) pairs of a class, computed once per class"""
+    fields = _FIELDS.get(cls)
+    if fields is None:
+        fields = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for slot in slots:
+                if not slot.startswith("_"):
+                    fields.append((slot, cls.__wire_names__.get(slot, _camel_case(slot))))
+        _FIELDS[cls] = fields
+    return fields
+
+
+class Serializable:
+    """
+    Base class of the commands and props sent to the UI
+
+    Every public slot is sent under its camelCased name, unless the class
+    overrides the name in __wire_names__. With a locale, Translatables are
+    resolved to the text in that locale.
+    """
+
+    __slots__ = ()
+    __wire_names__ = {}
+
+    def toDict(self, locale=None):
+        return self._to_wire(locale)
+
+    def _to_wire(self, locale):
+        dict = {}
+        dict["__type__"] = type(self).__name__
+        for slot, name in _fields(type(self)):
+            dict[name] = serialize(getattr(self, slot), locale)
+        return dict
+
+
+class Immutable(Serializable):
+    """Serializable that does not change after creation, serialized once per locale"""
+
+    __slots__ = "_wire"
+
+    def toDict(self, locale=None):
+        try:
+            wire = self._wire
+        except AttributeError:
+            wire = self._wire = {}
+
+        if locale not in wire:
+            wire[locale] = self._to_wire(locale)
+        return wire[locale]
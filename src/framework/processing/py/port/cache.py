@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+from port.lazy import LazyTable
+
+# Total (shallow) size of the DataFrames kept in a result cache
+MAX_CACHE_SIZE = 256 * 1024 * 1024
+
+
+class ResultCache:
+    """
+    Extraction results of the files submitted for a platform, keyed by DDP fingerprint
+
+    When the participant submits the same file again in the retry loop the
+    result is returned instead of extracting it again. Least recently used
+    results are evicted when their total size exceeds max_size, results
+    larger than that are never cached. put returns the evicted results, so
+    that what they hold can be released.
+    """
+
+    __slots__ = "entries", "size", "max_size"
+
+    def __init__(self, max_size=MAX_CACHE_SIZE):
+        self.entries = OrderedDict()
+        self.size = 0
+        self.max_size = max_size
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        if key is None or size > self.max_size:
+            return []
+
+        evicted = []
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[1]
+            evicted.append(previous[0])
+
+        while self.entries and self.size + size > self.max_size:
+            _, (evicted_value, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            evicted.append(evicted_value)
+
+        self.entries[key] = (value, size)
+        self.size += size
+        return evicted
+
+    def values(self):
+        return [value for value, _ in self.entries.values()]
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+
+
+def result_size(result):
+    """
+    Shallow memory usage of the tables in an extraction result
+
+    A lazy table that is not built yet counts the size of its full frame,
+    extrapolated from the size per row of its preview.
+    """
+    size = 0
+    for table in result.values():
+        data = table["data"]
+        if not isinstance(data, LazyTable):
+            size += _frame_size(data)
+        elif data.is_built():
+            size += _frame_size(data.preview) + _frame_size(data.frame())
+        elif len(data.preview) > 0:
+            size += _frame_size(data.preview) * max(data.estimated_count, len(data.preview)) // len(data.preview)
+    return size
+
+
+def _frame_size(frame):
+    return int(frame.memory_usage(index=True).sum())
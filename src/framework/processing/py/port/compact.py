@@ -0,0 +1,88 @@
+import logging
+import re
+
+import pandas as pd
+
+from port.tracking import Span
+
+logger = logging.getLogger(__name__)
+
+# Store a string column as categorical when it has at most this many distinct values per row
+CATEGORY_RATIO = 0.5
+
+# Values looked at to decide whether a string column holds timestamps
+TIMESTAMP_SAMPLE = 20
+
+# Only unambiguous ISO 8601 timestamps are parsed, localized dates are left as they are
+ISO_TIMESTAMP = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+# pandas 1 (Pyodide) parses every ISO 8601 variant by default, pandas 2 infers one format from the first
+# value unless told to: a takeout mixes "...:00Z" and "...:00.123Z"
+ISO_FORMAT = {"format": "ISO8601"} if int(pd.__version__.split(".")[0]) >= 2 else {}
+
+
+def compact(frame):
+    """
+    Return frame with a memory-compact representation of its columns
+
+    String columns holding ISO 8601 timestamps become datetime64, string
+    columns with many repeated values become categoricals and an index that
+    is not a RangeIndex is replaced by one. Columns of other types, and
+    string columns with unhashable values, are left as they are.
+    """
+    columns = {}
+    for name, column in frame.items():
+        if _is_string(column):
+            column = _compact_strings(column)
+        columns[name] = column
+
+    out = pd.DataFrame(columns, columns=frame.columns)
+    if not isinstance(frame.index, pd.RangeIndex):
+        out = out.reset_index(drop=True)
+    return out
+
+
+def compact_result(platform, result):
+    """Compact the tables in an extraction result in place, the memory saved is recorded per table"""
+    for key, table in result.items():
+        data = table["data"]
+        if isinstance(data, pd.DataFrame):
+            table["data"] = _measured(platform, key, data)
+        else:
+            # lazy tables: the preview now, the full table when it is built
+            data.transform(lambda frame, key=key: _measured(platform, key, frame))
+    return result
+
+
+def _measured(platform, key, frame):
+    with Span("compact", platform=platform, table=key) as span:
+        out = compact(frame)
+        span.set(
+            rows=len(out),
+            before_bytes=int(frame.memory_usage(index=True, deep=True).sum()),
+            after_bytes=int(out.memory_usage(index=True, deep=True).sum()),
+        )
+    return out
+
+
+def _is_string(column):
+    return column.dtype == object or isinstance(column.dtype, pd.StringDtype)
+
+
+def _compact_strings(column):
+    sample = column.dropna().head(TIMESTAMP_SAMPLE)
+    if len(sample) > 0 and all(isinstance(value, str) and ISO_TIMESTAMP.match(value) for value in sample):
+        parsed = pd.to_datetime(column, utc=True, errors="coerce", **ISO_FORMAT)
+        # keep the strings when any of them is not a timestamp after all
+        if parsed.isna().sum() == column.isna().sum():
+            return parsed
+
+    try:
+        distinct = column.nunique(dropna=False)
+    except TypeError:
+        # unhashable cells (lists, dicts)
+        return column
+
+    if len(column) > 1 and distinct <= len(column) * CATEGORY_RATIO:
+        return column.astype("category")
+    return column
@@ -0,0 +1,154 @@
+import json
+import logging
+
+from port.api.commands import CommandUITablePage
+from port.encoding import DATE_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# Rows per page, equal to the page size of the tables in the consent form
+PAGE_SIZE = 7
+
+# Tables up to this number of rows are sent to the consent form in one go
+PAGING_THRESHOLD = 500
+
+# Rows of a donated table serialized at a time
+RECORDS_CHUNK = 10000
+
+
+class TablePager:
+    """
+    Serves pages of the paged consent form tables on request of the UI,
+    and turns the consent sent back by the UI into the donated tables
+
+    Rows are identified by their position in the DataFrame. A request
+    carries the page, the search query and the rows the participant
+    deleted so far, the selection of the last request is kept so that
+    paging through search results does not search again. The consent only
+    carries the deleted rows of every table, see resolve().
+
+    When a table only holds a preview, sources maps its id to a callable
+    returning the full DataFrame; it is called on the first request that
+    needs more than the first page. sampled holds the ids of the tables of
+    which only a sample was extracted (see port.preflight), they are listed
+    in the donation.
+    """
+
+    __slots__ = "tables", "sources", "sampled", "frames", "text", "selection"
+
+    def __init__(self, consent_form, sources=None, sampled=()):
+        self.tables = {table.id: table for table in consent_form.tables + consent_form.meta_tables}
+        self.sources = sources or {}
+        self.sampled = list(sampled)
+        self.frames = {}
+        self.text = {}
+        self.selection = None
+
+    def page(self, request_json):
+        request = json.loads(request_json)
+        table = self.tables[request["id"]]
+
+        positions = self._select(table, request.get("query", []), request.get("deleted", []))
+        # deletions can leave the requested page beyond the last one
+        last_page = max(0, (len(positions) - 1) // table.page_size)
+        page = min(max(0, int(request.get("page", 0))), last_page)
+        start = page * table.page_size
+        page_positions = positions[start:start + table.page_size]
+
+        frame = self._frame(table).iloc[page_positions]
+        frame = frame.set_axis(page_positions, axis=0)
+        return CommandUITablePage(table.id, page, len(positions), frame, table.encoding)
+
+    def resolve(self, consent_json):
+        """
+        Replace the deletions sent back for the tables by the remaining rows
+
+        Every table comes back as {id: {"deleted": [positions]}}, tables
+        sent back as a list of rows are donated as they are. The sampled
+        tables that are donated are listed in a {"sampled": [ids]} entry.
+        """
+        return "".join(self.fragments(consent_json))
+
+    def fragments(self, consent_json):
+        """
+        resolve() as string fragments, for port.donation
+
+        The records of a table are serialized RECORDS_CHUNK rows at a time
+        and spliced into the document as they are.
+        """
+        consent = json.loads(consent_json)
+        donated = [id for entry in consent for id in entry]
+        sampled = [id for id in self.sampled if id in donated]
+        if sampled:
+            consent.append({"sampled": sampled})
+
+        yield "["
+        for i, entry in enumerate(consent):
+            yield ", {" if i else "{"
+            for j, (id, value) in enumerate(entry.items()):
+                yield f"{', ' if j else ''}{json.dumps(id)}: "
+                table = self.tables.get(id)
+                if table is not None and isinstance(value, dict):
+                    yield from self._records(table, value.get("deleted", []))
+                else:
+                    yield json.dumps(value)
+            yield "}"
+        yield "]"
+
+    def _select(self, table, query, deleted):
+        words = tuple(word for word in query if word)
+        key = (table.id, words, tuple(deleted))
+        if self.selection is not None and self.selection[0] == key:
+            return self.selection[1]
+
+        # imported on first use, importing port does not load numpy
+        import numpy as np
+
+        mask = _remaining(len(self._frame(table)), deleted)
+
+        # every word has to occur in at least one of the cells of a row
+        for word in words:
+            word_mask = np.zeros(len(mask), dtype=bool)
+            for column in self._text(table):
+                word_mask |= column.str.contains(word, regex=False).to_numpy()
+            mask &= word_mask
+
+        positions = np.flatnonzero(mask)
+        self.selection = (key, positions)
+        return positions
+
+    def _text(self, table):
+        columns = self.text.get(table.id)
+        if columns is None:
+            columns = [column.astype(str) for _, column in self._frame(table).items()]
+            self.text[table.id] = columns
+        return columns
+
+    def _frame(self, table):
+        frame = self.frames.get(table.id)
+        if frame is None:
+            source = self.sources.get(table.id)
+            frame = table.data_frame if source is None else source()
+            self.frames[table.id] = frame
+        return frame
+
+    def _records(self, table, deleted):
+        frame = self._frame(table)
+        if deleted:
+            frame = frame.iloc[_remaining(len(frame), deleted)]
+
+        yield "["
+        for start in range(0, len(frame), RECORDS_CHUNK):
+            chunk = frame.iloc[start:start + RECORDS_CHUNK].to_json(orient="records", date_format=DATE_FORMAT)
+            # the rows without the brackets of their array
+            yield f",{chunk[1:-1]}" if start else chunk[1:-1]
+        yield "]"
+
+
+def _remaining(row_count, deleted):
+    import numpy as np
+
+    mask = np.ones(row_count, dtype=bool)
+    if deleted:
+        mask[[position for position in map(int, deleted) if position < row_count]] = False
+    return mask
@@ -0,0 +1,101 @@
+import base64
+import hashlib
+import itertools
+import json
+import zlib
+
+from port.api.commands import CommandSystemDonate
+
+# Compressed bytes per donated part, payloads up to this many UTF-8 bytes are donated as they are
+CHUNK_SIZE = 512 * 1024
+
+# Characters handed to the compressor at a time
+SLICE_SIZE = 64 * 1024
+
+ENCODING = "gzip+base64"
+
+
+def donate(key, data, chunk_size=CHUNK_SIZE):
+    """
+    Generate the donation commands for data under key, returns its size in UTF-8 bytes
+
+    data is a JSON string or an iterable of string fragments that together
+    form the JSON document. Payloads up to chunk_size bytes are donated in
+    one command, larger ones are donated in parts, see donate_chunked. The
+    fragments are consumed as they are compressed, only the first chunk_size
+    bytes of them are held to decide which.
+    """
+    fragments = _fragments(data)
+    head = []
+    size = 0
+    for fragment in fragments:
+        head.append(fragment)
+        size += len(fragment.encode("utf-8"))
+        if size > chunk_size:
+            return (yield from donate_chunked(key, itertools.chain(head, fragments), chunk_size))
+    yield CommandSystemDonate(key, "".join(head))
+    return size
+
+
+def donate_chunked(key, data, chunk_size=CHUNK_SIZE):
+    """
+    Donate data as one gzip stream cut in sequence-numbered parts
+
+    Every part is donated under "<key>/part-<seq>" with its own checksum,
+    followed by a manifest under "<key>/manifest". The receiver concatenates
+    the decoded parts in seq order and gunzips the result; the manifest
+    tells which parts are missing after an interrupted transfer. Returns
+    the size of data in UTF-8 bytes.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    digest = hashlib.sha256()
+    size = 0
+    buffer = bytearray()
+    parts = []
+
+    for fragment in _fragments(data):
+        raw = fragment.encode("utf-8")
+        digest.update(raw)
+        size += len(raw)
+        buffer += compressor.compress(raw)
+        while len(buffer) >= chunk_size:
+            yield _part(key, parts, bytes(buffer[:chunk_size]))
+            del buffer[:chunk_size]
+
+    buffer += compressor.flush()
+    while buffer:
+        yield _part(key, parts, bytes(buffer[:chunk_size]))
+        del buffer[:chunk_size]
+
+    manifest = {
+        "key": key,
+        "encoding": ENCODING,
+        "size": size,
+        "sha256": digest.hexdigest(),
+        "parts": parts,
+    }
+    yield CommandSystemDonate(f"{key}/manifest", json.dumps(manifest))
+    return size
+
+
+def _part(key, parts, chunk):
+    seq = len(parts)
+    checksum = hashlib.sha256(chunk).hexdigest()
+    parts.append({"seq": seq, "size": len(chunk), "sha256": checksum})
+
+    part = {
+        "key": key,
+        "seq": seq,
+        "encoding": ENCODING,
+        "sha256": checksum,
+        "data": base64.b64encode(chunk).decode("ascii"),
+    }
+    return CommandSystemDonate(f"{key}/part-{seq}", json.dumps(part))
+
+
+def _fragments(data):
+    if isinstance(data, str):
+        for start in range(0, len(data), SLICE_SIZE):
+            yield data[start:start + SLICE_SIZE]
+    else:
+        yield from data
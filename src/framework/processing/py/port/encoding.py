@@ -0,0 +1,70 @@
+import json
+
+# pandas is not imported here, the frames bring their methods along
+# and importing port does not have to load pandas
+
+# "json": DataFrame.to_json(), a {column: {index: value}} object
+# "columnar": one array per column sharing a single index array,
+#             columns with many repeated strings are dictionary encoded
+ENCODINGS = ("json", "columnar")
+DEFAULT_ENCODING = "columnar"
+
+# Dictionary encode a column when it has at most this many distinct values per row
+DICTIONARY_RATIO = 0.5
+
+# Timestamps are sent as ISO 8601 strings, as they appear in the DDPs
+DATE_FORMAT = "iso"
+
+
+def encode(frame, encoding=DEFAULT_ENCODING):
+    if encoding == "json":
+        return frame.to_json(date_format=DATE_FORMAT)
+    if encoding == "columnar":
+        return encode_columnar(frame)
+    raise ValueError(f"Unknown table encoding: {encoding}")
+
+
+def encode_columnar(frame):
+    """
+    Encode a DataFrame as {"index": [...], "columns": [...]}
+
+    Every column is either {"name", "values"} or {"name", "dictionary", "codes"},
+    where codes index into dictionary and -1 denotes a missing value. Values
+    are serialized by pandas, so they come out exactly as in DataFrame.to_json(date_format="iso"),
+    the format of the donated records (see port.consent).
+    """
+    columns = [_encode_column(name, column) for name, column in frame.items()]
+    index = _values(frame.index.to_series())
+    return '{"index":' + index + ',"columns":[' + ",".join(columns) + "]}"
+
+
+def _encode_column(name, column):
+    name = json.dumps(str(name))
+    if _is_dictionary_candidate(column):
+        codes, uniques = column.factorize()
+        dictionary = _values(uniques.to_series())
+        codes = json.dumps(codes.tolist(), separators=(",", ":"))
+        return '{"name":' + name + ',"dictionary":' + dictionary + ',"codes":' + codes + "}"
+    return '{"name":' + name + ',"values":' + _values(column) + "}"
+
+
+def _is_dictionary_candidate(column):
+    if column.dtype.name == "category":
+        return True
+    # object columns, and the string columns of pandas 3, are of kind "O"
+    if column.dtype.kind != "O" or len(column) < 2:
+        return False
+    try:
+        return column.nunique(dropna=False) <= len(column) * DICTIONARY_RATIO
+    except TypeError:
+        # unhashable cells (lists, dicts) are sent as they are
+        return False
+
+
+def _values(series):
+    if getattr(series.dtype, "tz", None) is not None and len(series) > 0:
+        # Series.to_json drops the "Z" of time zone aware timestamps, DataFrame.to_json keeps it:
+        # the column is serialized as a frame, [["a"],[null]] becomes ["a",null]
+        rows = series.to_frame().to_json(orient="values", date_format=DATE_FORMAT)
+        return rows[1:-1].replace("],[", ",")
+    return series.to_json(orient="values", date_format=DATE_FORMAT)
@@ -0,0 +1,312 @@
+import codecs
+import html
+import logging
+import re
+import zipfile
+import zlib
+
+import pandas as pd
+
+from port.jsonstream import CHUNK_SIZE
+from port.lazy import LazyTable, PREVIEW_ROWS
+from port import progress
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+
+# Errors reading a member of the DDP to the end, a corrupt or truncated compressed stream.
+# The parser itself does not fail on malformed HTML, and undecodable bytes are replaced.
+READ_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError)
+
+
+# A comment, a declaration or a start or end tag
+TOKEN = re.compile(r"<!--.*?-->|<![^>]*>|<(/?)([a-zA-Z][^\s/>]*)([^>]*)>", re.S)
+ATTRIBUTE = re.compile(r"""([a-zA-Z_:][-\w:.]*)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+
+
+class _CellParser:
+    """
+    Event based parser over the cells of a Google Takeout HTML page
+
+    No tree is built: the document is fed in pieces and scanned for tags.
+    Outside a cell the scanner jumps from one candidate start tag (matched
+    by cell_start, confirmed by is_cell) to the next. While inside a cell
+    the text is collected in lines, split on <br>, together with the
+    (href, text) of its links. When the cell closes it is turned into a
+    row by to_row, rows are taken from the parser with pop_rows() while
+    the document is being fed.
+
+    The scanner only handles what the Takeout pages contain, it is not a
+    general HTML parser (html.parser is, but is several times slower).
+    """
+
+    columns = []
+    # (tag, attributes) of the start tags that might open a cell
+    cell_start = None
+
+    def __init__(self):
+        self.buffer = ""
+        self.rows = []
+        self.cell_tag = None
+        self.depth = 0
+        self.lines = None
+        self.links = None
+        self.in_link = False
+
+    def pop_rows(self):
+        rows = self.rows
+        self.rows = []
+        return rows
+
+    def feed(self, data):
+        buffer = self.buffer + data
+        pos = 0
+        while True:
+            if self.lines is None:
+                match = self.cell_start.search(buffer, pos)
+                if match is None:
+                    # keep what might be the beginning of the next cell
+                    start = buffer.rfind("<", pos)
+                    pos = len(buffer) if start < 0 else start
+                    break
+                tag, attrs = match.groups()
+                pos = match.end()
+                self.handle_starttag(tag.lower(), attrs)
+                continue
+
+            match = TOKEN.search(buffer, pos)
+            if match is None:
+                break
+            if match.start() > pos:
+                self.handle_data(buffer[pos:match.start()])
+            closing, tag, attrs = match.groups()
+            pos = match.end()
+            if tag is None:
+                continue
+
+            tag = tag.lower()
+            if closing:
+                self.handle_endtag(tag)
+            else:
+                self.handle_starttag(tag, attrs)
+
+        # the text after the last tag is kept, it might continue in the next piece
+        self.buffer = buffer[pos:]
+
+    def close(self):
+        if self.buffer:
+            self.handle_data(self.buffer)
+            self.buffer = ""
+
+    def handle_starttag(self, tag, attrs):
+        if self.lines is None:
+            if self.is_cell(tag, _attribute(attrs, "class").split()):
+                self.cell_tag = tag
+                self.depth = 1
+                self.lines = [""]
+                self.links = []
+            return
+
+        if tag == self.cell_tag:
+            self.depth += 1
+        elif tag == "br":
+            self.lines.append("")
+        elif tag == "a":
+            self.links.append([_attribute(attrs, "href"), ""])
+            self.in_link = True
+
+    def handle_endtag(self, tag):
+        if self.lines is None:
+            return
+
+        if tag == "a":
+            self.in_link = False
+        elif tag == self.cell_tag:
+            self.depth -= 1
+            if self.depth == 0:
+                lines = [line.strip() for line in self.lines]
+                row = self.to_row([line for line in lines if line], [(href, text.strip()) for href, text in self.links])
+                if row is not None:
+                    self.rows.append(row)
+                self.lines = None
+                self.links = None
+                self.in_link = False
+
+    def handle_data(self, data):
+        if self.lines is None:
+            return
+        if "&" in data:
+            data = html.unescape(data)
+        self.lines[-1] += data
+        if self.in_link:
+            self.links[-1][1] += data
+
+
+class WatchHistoryParser(_CellParser):
+    """
+    Rows of watch-history.html (kijkgeschiedenis.html)
+
+    Every entry is an outer-cell of which the first content-cell reads
+    "Watched <a video>title</a><br><a channel>channel</a><br>date".
+    Entries without a link (removed videos) are skipped.
+    """
+
+    columns = ["Title", "Url", "Channel", "Date"]
+    cell_start = re.compile(r"<(div)(\s[^>]*content-cell[^>]*)>", re.I)
+
+    def is_cell(self, tag, classes):
+        return (
+            tag == "div"
+            and "content-cell" in classes
+            and "mdl-typography--body-1" in classes
+            and "mdl-typography--text-right" not in classes
+        )
+
+    def to_row(self, lines, links):
+        if not links:
+            return None
+        url, title = links[0]
+        channel = links[1][1] if len(links) > 1 else None
+        date = lines[-1] if len(lines) > 1 else None
+        return title, url, channel, date
+
+
+class CommentsParser(_CellParser):
+    """
+    Rows of my-comments.html (mijn-reacties.html)
+
+    Every comment is a list item reading
+    "You added a <a>comment</a> on <a video>title</a>.<br>date<br>comment".
+    """
+
+    columns = ["Comment", "Url", "Date"]
+    cell_start = re.compile(r"<(li)((?:\s[^>]*)?)>", re.I)
+
+    def is_cell(self, tag, classes):
+        return tag == "li"
+
+    def to_row(self, lines, links):
+        if not lines:
+            return None
+        url = links[-1][0] if links else None
+        date = lines[1] if len(lines) > 2 else None
+        return lines[-1], url, date
+
+
+def _attribute(attrs, name):
+    """Value of attribute name in the raw attribute text of a tag, empty string if it is not there"""
+    if name not in attrs:
+        return ""
+    for match in ATTRIBUTE.finditer(attrs):
+        if match.group(1).lower() == name:
+            value = next(group for group in match.groups()[1:] if group is not None)
+            return html.unescape(value) if "&" in value else value
+    return ""
+
+
+def _feed(fileobj, parser, read_size):
+    """Feed the document to the parser, yields (rows, bytes read so far) after every read"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    consumed = 0
+    while True:
+        data = fileobj.read(read_size)
+        consumed += len(data)
+        parser.feed(decoder.decode(data, final=not data))
+        if not data:
+            parser.close()
+        yield parser.pop_rows(), consumed
+        if not data:
+            return
+
+
+def iter_rows(fileobj, parser_class, read_size=READ_SIZE):
+    """Yield the rows of a Takeout HTML page one by one from a binary file object"""
+    for rows, _ in _feed(fileobj, parser_class(), read_size):
+        yield from rows
+
+
+def to_df(fileobj, parser_class, chunk_size=CHUNK_SIZE, max_rows=None):
+    """
+    Stream a Takeout HTML page into a DataFrame with the columns of parser_class
+
+    Only the rows are kept in memory, converted to a DataFrame in chunks of chunk_size.
+    With max_rows the page is only read up to the first max_rows rows. When the member
+    cannot be read to the end (READ_ERRORS) the rows before the error are kept.
+    """
+    return progress.run(to_df_steps(fileobj, None, parser_class, chunk_size, max_rows))
+
+
+def to_df_steps(fileobj, size, parser_class, chunk_size=CHUNK_SIZE, max_rows=None):
+    """to_df as a step (see port.progress), yields the fraction of the size bytes of the page read"""
+    out = pd.DataFrame(columns=parser_class.columns)
+    if fileobj is None:
+        return out
+
+    frames = []
+    rows = []
+    count = 0
+    try:
+        with fileobj:
+            for chunk, consumed in _feed(fileobj, parser_class(), READ_SIZE):
+                if max_rows is not None:
+                    chunk = chunk[:max_rows - count]
+                count += len(chunk)
+                rows.extend(chunk)
+                if len(rows) >= chunk_size:
+                    frames.append(pd.DataFrame(rows, columns=parser_class.columns))
+                    rows = []
+                if count == max_rows:
+                    break
+                if size:
+                    yield min(consumed / size, 1.0)
+    except READ_ERRORS as e:
+        logger.error("Could not read HTML to the end, kept the %d rows before the error:  %s", count, e)
+
+    if rows:
+        frames.append(pd.DataFrame(rows, columns=parser_class.columns))
+    if frames:
+        out = pd.concat(frames, ignore_index=True)
+    return out
+
+
+def preview(fileobj, size, parser_class, rows):
+    """
+    DataFrame of the first rows rows of a Takeout HTML page of size bytes
+
+    Returns the preview and the estimated number of rows in the whole page,
+    extrapolated from the rows found in the bytes read. The count is exact
+    when the page ends within the preview.
+    """
+    out = pd.DataFrame(columns=parser_class.columns)
+    if fileobj is None:
+        return out, 0
+
+    found = []
+    consumed = 0
+    try:
+        with fileobj:
+            for chunk, consumed in _feed(fileobj, parser_class(), READ_SIZE):
+                found.extend(chunk)
+                if len(found) > rows:
+                    break
+            else:
+                return pd.DataFrame(found, columns=parser_class.columns), len(found)
+    except READ_ERRORS as e:
+        logger.error("Could not preview HTML:  %s", e)
+        return out, 0
+
+    estimated_count = round(size * len(found) / consumed) if consumed else len(found)
+    return pd.DataFrame(found[:rows], columns=parser_class.columns), max(estimated_count, rows + 1)
+
+
+def lazy_table(ddp, name, parser_class, rows=PREVIEW_ROWS, max_rows=None):
+    """
+    Lazy table over a Takeout HTML member of the DDP, the full table is streamed from the zip when needed
+
+    With max_rows the table holds at most the first max_rows rows.
+    """
+    frame, estimated_count = preview(ddp.open(name), ddp.size(name), parser_class, rows)
+    if max_rows is not None:
+        estimated_count = min(estimated_count, max_rows)
+    return LazyTable(lambda: to_df(ddp.open(name), parser_class, max_rows=max_rows), frame, estimated_count)
@@ -0,0 +1,197 @@
+import codecs
+import json
+import logging
+from itertools import islice
+
+import pandas as pd
+
+from port.lazy import LazyTable, PREVIEW_ROWS
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+CHUNK_SIZE = 5000
+
+WHITESPACE = " \t\n\r"
+
+# Characters a number can continue with after the part that was decoded ("1" of "1e5", "2" of "2.5")
+NUMBER_TAIL = "+-.eE"
+
+# Characters from the end of the buffer within which a decode error can be caused by an element that is
+# split over reads: "tru" of true, a \uXXXX escape cut short
+SPLIT_MARGIN = 6
+
+
+class _ArrayReader:
+    """Incremental reader over a top-level JSON array in a binary file object"""
+
+    __slots__ = "fileobj", "decoder", "text_decoder", "read_size", "buffer", "pos", "offset", "eof"
+
+    def __init__(self, fileobj, read_size):
+        self.fileobj = fileobj
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.read_size = read_size
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def fill(self, size):
+        # Drop what has been consumed so the buffer stays bounded by the largest element
+        if self.pos > 0:
+            self.offset += _utf8_size(self.buffer[:self.pos])
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        data = self.fileobj.read(size)
+        if not data:
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            self.eof = True
+        else:
+            self.buffer += self.text_decoder.decode(data)
+
+    def peek(self):
+        """Return the next non-whitespace character, empty string at end of input"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                return ""
+            self.fill(self.read_size)
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at position {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # An element split over reads fails at the end of the buffer, a string where it starts.
+                # Other errors are in the document, reading on would only buffer the rest of it.
+                split = e.pos >= len(self.buffer) - SPLIT_MARGIN or e.msg.startswith("Unterminated string")
+                if self.eof or not split:
+                    raise
+                # Element is split over reads, grow geometrically to avoid re-decoding too often
+                self.fill(max(self.read_size, len(self.buffer) - self.pos))
+                continue
+
+            # A number at the end of the buffer might continue in the next read
+            if not self.eof and len(self.buffer) - end <= 2 and not self.buffer[end:].strip(NUMBER_TAIL):
+                self.fill(self.read_size)
+                continue
+
+            self.pos = end
+            return value
+
+    def consumed(self):
+        """Number of bytes consumed so far, the size of the document is in bytes too"""
+        return self.offset + _utf8_size(self.buffer[:self.pos])
+
+    def __iter__(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at position {self.pos - 1}, found {separator!r}")
+
+
+def _utf8_size(text):
+    # ASCII text, the common case, takes a byte per character
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def iter_array(fileobj, read_size=READ_SIZE):
+    """Yield the elements of a top-level JSON array one by one from a binary file object"""
+    return iter(_ArrayReader(fileobj, read_size))
+
+
+def preview_array(fileobj, size, rows):
+    """
+    Parse the first rows elements of a JSON array of size bytes
+
+    Returns the elements and the estimated number of elements in the whole
+    array, extrapolated from the share of the document the preview took.
+    The count is exact when the array ends within the preview.
+    """
+    if fileobj is None:
+        return [], 0
+
+    reader = _ArrayReader(fileobj, READ_SIZE)
+    try:
+        with fileobj:
+            elements = list(islice(iter(reader), rows + 1))
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.error("Could not preview JSON array:  %s", e)
+        return [], 0
+
+    if len(elements) <= rows:
+        return elements, len(elements)
+
+    elements = elements[:rows]
+    consumed = reader.consumed()
+    estimated_count = round(size * (rows + 1) / consumed) if consumed else rows
+    return elements, max(estimated_count, rows + 1)
+
+
+def array_to_df(fileobj, to_df, chunk_size=CHUNK_SIZE, max_rows=None):
+    """
+    Stream a JSON array into a DataFrame
+
+    Records are parsed and converted with to_df in chunks of chunk_size,
+    only one chunk of Python objects is alive at any time. With max_rows
+    only the first max_rows records are parsed. When the array is invalid
+    the records before the error are kept, and the error is logged.
+    """
+    out = pd.DataFrame()
+    if fileobj is None:
+        return out
+
+    frames = []
+    chunk = []
+    try:
+        with fileobj:
+            for record in islice(iter_array(fileobj), max_rows):
+                chunk.append(record)
+                if len(chunk) == chunk_size:
+                    records, chunk = chunk, []
+                    frames.append(to_df(records))
+    except (ValueError, UnicodeDecodeError) as e:
+        # the participant may have seen the table in the preview already, the records before the error are kept
+        logger.error("Could not stream JSON array, kept the %d records before the error:  %s",
+                     chunk_size * len(frames) + len(chunk), e)
+    if chunk:
+        frames.append(to_df(chunk))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if frames:
+        out = pd.concat(frames, ignore_index=True)
+    return out
+
+
+def lazy_array(ddp, name, to_df, rows=PREVIEW_ROWS, max_rows=None):
+    """
+    Lazy table over a JSON array member of the DDP, the full table is streamed from the zip when needed
+
+    With max_rows the table holds at most the first max_rows records.
+    """
+    records, estimated_count = preview_array(ddp.open(name), ddp.size(name), rows)
+    preview = to_df(records)
+    if max_rows is not None:
+        estimated_count = min(estimated_count, max_rows)
+    return LazyTable(lambda: array_to_df(ddp.open(name), to_df, max_rows=max_rows), preview, estimated_count)
@@ -0,0 +1,40 @@
+from port.tracking import Span
+
+# Rows parsed for the preview of a lazy table
+PREVIEW_ROWS = 100
+
+
+class LazyTable:
+    """
+    Extracted table of which the full DataFrame is only built when needed
+
+    The preview (first rows of the table) and the estimated row count are
+    cheap to compute and are all the consent form needs to render.
+    The full DataFrame is built by calling build, at most once.
+    """
+
+    __slots__ = "build", "preview", "estimated_count", "_frame"
+
+    def __init__(self, build, preview, estimated_count):
+        self.build = build
+        self.preview = preview
+        self.estimated_count = estimated_count
+        self._frame = None
+
+    def is_built(self):
+        return self._frame is not None
+
+    def transform(self, fun):
+        """Apply fun to the preview now and to the full DataFrame when it is built"""
+        build = self.build
+        self.preview = fun(self.preview)
+        self.build = lambda: fun(build())
+        if self._frame is not None:
+            self._frame = fun(self._frame)
+
+    def frame(self):
+        if self._frame is None:
+            with Span("build_table", estimated_rows=self.estimated_count) as span:
+                self._frame = self.build()
+                span.measure(self._frame)
+        return self._frame
@@ -1,19 +1,66 @@
 from collections.abc import Generator
 from port.script import process
+from port.api.commands import CommandBatch, CommandSystemDonate
+from port.tracking import Span
+
+# Commands of which the serialization is tracked, the others are small
+TRACKED_COMMANDS = ("CommandUIRender", "CommandUITablePage")
+
+# Donated characters after which the collected system commands are sent without waiting for a UI command
+MAX_BATCH_SIZE = 4 * 1024 * 1024
 
 
 class ScriptWrapper(Generator):
-    def __init__(self, script):
+    """
+    Drives the script for py_worker.js, one send per run cycle
+
+    System commands do not need an answer from the UI, so they are collected
+    and sent in one CommandBatch with the next UI command. The script is
+    answered with None for them, the batch with the response to its UI command.
+    """
+
+    def __init__(self, script, locale=None):
         self.script = script
+        self.locale = locale
+        self.finished = False
 
     def send(self, data):
-        command = self.script.send(data)
-        return command.toDict()
+        if self.finished:
+            raise StopIteration
+
+        commands = []
+        size = 0
+        try:
+            command = self.script.send(data)
+            while isinstance(command, CommandSystemDonate):
+                commands.append(self.serialize(command))
+                size += len(command.json_string)
+                if size >= MAX_BATCH_SIZE:
+                    break
+                command = self.script.send(None)
+            else:
+                commands.append(self.serialize(command))
+        except StopIteration:
+            # the commands collected before the end are sent first
+            self.finished = True
+            if not commands:
+                raise
+
+        if len(commands) == 1:
+            return commands[0]
+        return CommandBatch(commands).toDict(self.locale)
+
+    def serialize(self, command):
+        if type(command).__name__ not in TRACKED_COMMANDS:
+            return command.toDict(self.locale)
+
+        with Span("serialize", command=type(command).__name__):
+            return command.toDict(self.locale)
 
     def throw(self, type=None, value=None, traceback=None):
         raise StopIteration
 
 
-def start(sessionId):
+def start(sessionId, locale=None):
     script = process(sessionId)
-    return ScriptWrapper(script)
+    return ScriptWrapper(script, locale)
@@ -0,0 +1,67 @@
+import importlib
+
+import port.api.props as props
+from port import progress
+from port.tracking import Span
+
+EMPTY_RESULT_TITLE = props.Translatable(
+    {
+        "en": "We could not extract any data:",
+        "nl": "We konden de gegevens niet in je donatie vinden:",
+    }
+)
+
+
+class Platform:
+    """
+    A platform of which participants can donate their DDP
+
+    module holds the extract function of the platform. It is imported when
+    the first file for the platform is submitted: pandas and the ddpinspect
+    parsers are not loaded before the first page is shown, and not at all
+    for platforms that are skipped.
+    """
+
+    __slots__ = "name", "module"
+
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+
+    def extract(self, ddp):
+        """Return the validation of the DDP and its extracted tables, compacted and redacted"""
+        return progress.run(self.extract_steps(ddp))
+
+    def extract_steps(self, ddp):
+        """
+        extract as a step (see port.progress)
+
+        The extract function of the module is a generator that yields the
+        fraction of the DDP it has processed between files and chunks, the
+        script renders that progress and stops extracting on cancel.
+        """
+        # imported on first use, see above
+        from port.compact import compact_result
+        from port.redact import redact_result
+
+        validation, result = yield from importlib.import_module(self.module).extract(ddp)
+        # redacted after compacting, the distinct values of categorical columns are redacted only once
+        return validation, redact_result(self.name, compact_result(self.name, result))
+
+    def empty_result(self):
+        import pandas as pd
+
+        df = pd.DataFrame(["No data found"], columns=["No data found"])
+        return {"empty": {"data": df, "title": EMPTY_RESULT_TITLE}}
+
+
+PLATFORMS = [
+    Platform("Twitter", "port.platforms.twitter"),
+    Platform("Instagram", "port.platforms.instagram"),
+    Platform("Facebook", "port.platforms.facebook"),
+    Platform("YouTube", "port.platforms.youtube"),
+]
+
+
+def table_span(ddp, platform, name):
+    return Span("table", platform=platform, file=name, input_bytes=ddp.size(name))
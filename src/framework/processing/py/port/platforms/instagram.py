@@ -0,0 +1,74 @@
+import pandas as pd
+
+from ddpinspect import unzipddp
+from ddpinspect import instagram
+
+import port.api.props as props
+from port import preflight
+from port.platforms import table_span
+
+TABLE_TITLES = {
+    "instagram_your_topics": props.Translatable(
+        {
+            "en": "Topics in which you are interested in according to Instagram:",
+            "nl": "Onderwerpen waar jij volgens Instagram geintereseerd in bent:",
+        }
+    ),
+    "instagram_interests": props.Translatable(
+        {
+            "en": "Your interests according to Instagram:",
+            "nl": "Jouw interesses volgens Instagram:",
+        }
+    ),
+    "instagram_account_created_at": props.Translatable(
+        {
+            "en": "Date of your account creation on Instagram:",
+            "nl": "Datum waarop je account is aangemaakt op Instagram:",
+        }
+    ),
+}
+
+
+def extract(instagram_zip):
+    result = {}
+
+    validation = instagram_zip.validate(instagram)
+    # the files are read at once, files too large for that are skipped as if they were missing
+    preflight.plan(instagram_zip, "Instagram", {
+        "ads_interests.json": False,
+        "your_topics.json": False,
+        "signup_information.json": False,
+    })
+
+    with table_span(instagram_zip, "Instagram", "ads_interests.json") as span:
+        interests_bytes = instagram_zip.read("ads_interests.json")
+        interests_dict = unzipddp.read_json_from_bytes(interests_bytes)
+        interests = instagram.interests_to_list(interests_dict)
+        if interests:
+            df = pd.DataFrame(interests, columns=["Interests"])
+            result["interests"] = {"data": df, "title": TABLE_TITLES["instagram_interests"]}
+            span.measure(df)
+
+    yield 1 / 3
+
+    with table_span(instagram_zip, "Instagram", "your_topics.json") as span:
+        your_topics_bytes = instagram_zip.read("your_topics.json")
+        your_topics_dict = unzipddp.read_json_from_bytes(your_topics_bytes)
+        your_topics = instagram.your_topics_to_list(your_topics_dict)
+        if your_topics:
+            df = pd.DataFrame(your_topics, columns=["Your Topics"])
+            result["your_topics"] = {"data": df, "title": TABLE_TITLES["instagram_your_topics"]}
+            span.measure(df)
+
+    yield 2 / 3
+
+    with table_span(instagram_zip, "Instagram", "signup_information.json") as span:
+        account_created_at_bytes = instagram_zip.read("signup_information.json")
+        account_created_at_dict = unzipddp.read_json_from_bytes(account_created_at_bytes)
+        account_created_at = instagram.account_created_at_to_list(account_created_at_dict)
+        if account_created_at:
+            df = pd.DataFrame(account_created_at, columns=["Account created at"])
+            result["account_created_at"] = {"data": df, "title": TABLE_TITLES["instagram_account_created_at"]}
+            span.measure(df)
+
+    return validation, result
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from ddpinspect import twitter
+
+import port.api.props as props
+from port import preflight
+from port.platforms import table_span
+
+TABLE_TITLES = {
+    "twitter_interests": props.Translatable(
+        {
+            "en": "Your interests according to Twitter:",
+            "nl": "Jouw interesses volgens Twitter:",
+        }
+    ),
+    "twitter_account_created_at": props.Translatable(
+        {
+            "en": "Date of your account creation on Twitter:",
+            "nl": "Datum waarop je account is aangemaakt op Twitter:",
+        }
+    ),
+}
+
+
+def extract(twitter_zip):
+    result = {}
+
+    validation = twitter_zip.validate(twitter)
+    # the files are read at once, files too large for that are skipped as if they were missing
+    preflight.plan(twitter_zip, "Twitter", {"personalization.js": False, "account.js": False})
+
+    with table_span(twitter_zip, "Twitter", "personalization.js") as span:
+        interests_bytes = twitter_zip.read("personalization.js")
+        interests_listdict = twitter.bytesio_to_listdict(interests_bytes)
+        interests = twitter.interests_to_list(interests_listdict)
+
+        if interests:
+            df = pd.DataFrame(interests, columns=["Interests"])
+            result["interests"] = {"data": df, "title": TABLE_TITLES["twitter_interests"]}
+            span.measure(df)
+
+    yield 1 / 2
+
+    with table_span(twitter_zip, "Twitter", "account.js") as span:
+        account_created_at_bytes = twitter_zip.read("account.js")
+        account_created_at_listdict = twitter.bytesio_to_listdict(account_created_at_bytes)
+        account_created_at = twitter.account_created_at_to_list(account_created_at_listdict)
+
+        if account_created_at:
+            df = pd.DataFrame(account_created_at, columns=["Account created at"])
+            result["account_created_at"] = {"data": df, "title": TABLE_TITLES["twitter_account_created_at"]}
+            span.measure(df)
+
+    return validation, result
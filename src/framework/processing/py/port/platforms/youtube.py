@@ -0,0 +1,151 @@
+from ddpinspect import unzipddp
+from ddpinspect import youtube
+from ddpinspect.validate import Language
+from ddpinspect.validate import DDPFiletype
+
+import port.api.props as props
+from port import aggregate
+from port import htmlstream
+from port import jsonstream
+from port import preflight
+from port import progress
+from port.platforms import table_span
+
+TABLE_TITLES = {
+    "youtube_watch_history": props.Translatable(
+        {
+            "en": "Videos you watched on YouTube:",
+            "nl": "Videos die je op YouTube hebt gekeken:",
+        }
+    ),
+    "youtube_watch_history_per_channel": props.Translatable(
+        {
+            "en": "How often you watched videos of each channel on YouTube:",
+            "nl": "Hoe vaak je video's van elk kanaal op YouTube hebt gekeken:",
+        }
+    ),
+    "youtube_watch_history_per_channel_per_day": props.Translatable(
+        {
+            "en": "How often you watched videos of each channel on YouTube per day:",
+            "nl": "Hoe vaak je video's van elk kanaal op YouTube hebt gekeken per dag:",
+        }
+    ),
+    "youtube_watch_history_per_channel_per_week": props.Translatable(
+        {
+            "en": "How often you watched videos of each channel on YouTube per week:",
+            "nl": "Hoe vaak je video's van elk kanaal op YouTube hebt gekeken per week:",
+        }
+    ),
+    "youtube_subscriptions": props.Translatable(
+        {
+            "en": "Channels you are subscribed to on Youtube:",
+            "nl": "Kanalen waarop je geabboneerd bent op Youtube:",
+        }
+    ),
+    "youtube_comments": props.Translatable(
+        {
+            "en": "Comments you posted on Youtube:",
+            "nl": "Reacties die je hebt geplaats op Youtube:",
+        }
+    ),
+}
+
+# Tables offered of the watch history: "views" are the videos watched, the
+# others are aggregates of them (see port.aggregate) that are much smaller
+# to render and donate. The raw views are the default: a study adds the
+# aggregates it needs, and leaves out "views" to offer them instead.
+WATCH_HISTORY_TABLES = ("views",)
+
+
+def watch_history_tables(watch_history, sampled):
+    views = aggregate.of_table(watch_history, [name for name in WATCH_HISTORY_TABLES if name != "views"])
+    tables = {}
+    for name in WATCH_HISTORY_TABLES:
+        if name == "views":
+            key, data = "watch_history", watch_history
+        elif name in views:
+            key, data = f"watch_history_{name}", views[name]
+        else:
+            continue
+        tables[key] = {"data": data, "title": TABLE_TITLES[f"youtube_{key}"], "sampled": sampled}
+    return tables
+
+
+def extract(youtube_zip):
+    result = {}
+
+    validation = youtube_zip.validate(youtube)
+    if validation.ddp_category is not None:
+        if validation.ddp_category.language == Language.EN:
+            subscriptions_fn = "subscriptions.csv"
+            watch_history_fn = "watch-history"
+            comments_fn = "my-comments.html"
+        else:
+            subscriptions_fn = "abonnementen.csv"
+            watch_history_fn = "kijkgeschiedenis"
+            comments_fn = "mijn-reacties.html"
+
+        if validation.ddp_category.ddp_filetype == DDPFiletype.JSON:
+            watch_history_fn = watch_history_fn + ".json"
+        if validation.ddp_category.ddp_filetype == DDPFiletype.HTML:
+            watch_history_fn = watch_history_fn + ".html"
+
+        # the watch history and the comments are streamed, sampled when they are too large for that
+        modes = preflight.plan(
+            youtube_zip, "YouTube", {subscriptions_fn: False, watch_history_fn: True, comments_fn: True}
+        )
+        watch_history_rows = preflight.max_rows(modes[watch_history_fn])
+        comments_rows = preflight.max_rows(modes[comments_fn])
+
+        yield 0.1
+
+        # Get subscriptions
+        with table_span(youtube_zip, "YouTube", subscriptions_fn) as span:
+            subscriptions_bytes = youtube_zip.read(subscriptions_fn)
+            subscriptions_listdict = unzipddp.read_csv_from_bytes(subscriptions_bytes)
+            df = youtube.to_df(subscriptions_listdict)
+            if not df.empty:
+                result["subscriptions"] = {"data": df, "title": TABLE_TITLES["youtube_subscriptions"]}
+                span.measure(df)
+
+        yield 0.2
+
+        # Get watch history
+        if validation.ddp_category.ddp_filetype == DDPFiletype.JSON:
+            with table_span(youtube_zip, "YouTube", watch_history_fn) as span:
+                watch_history = jsonstream.lazy_array(
+                    youtube_zip, watch_history_fn, youtube.to_df, max_rows=watch_history_rows
+                )
+                if not watch_history.preview.empty:
+                    result.update(watch_history_tables(watch_history, watch_history_rows is not None))
+                    # only the preview is built here, the full table is built when it is needed
+                    span.measure(watch_history.preview)
+                    span.set(estimated_rows=watch_history.estimated_count)
+        if validation.ddp_category.ddp_filetype == DDPFiletype.HTML:
+            with table_span(youtube_zip, "YouTube", watch_history_fn) as span:
+                watch_history = htmlstream.lazy_table(
+                    youtube_zip, watch_history_fn, htmlstream.WatchHistoryParser, max_rows=watch_history_rows
+                )
+                if not watch_history.preview.empty:
+                    result.update(watch_history_tables(watch_history, watch_history_rows is not None))
+                    span.measure(watch_history.preview)
+                    span.set(estimated_rows=watch_history.estimated_count)
+
+        yield 0.3
+
+        # Get comments, the page is parsed in full here
+        with table_span(youtube_zip, "YouTube", comments_fn) as span:
+            comments = htmlstream.to_df_steps(
+                youtube_zip.open(comments_fn), youtube_zip.size(comments_fn), htmlstream.CommentsParser,
+                max_rows=comments_rows
+            )
+            df = yield from progress.scaled(comments, 0.3, 1.0)
+            if not df.empty:
+                result["comments"] = {
+                    "data": df,
+                    "title": TABLE_TITLES["youtube_comments"],
+                    "sampled": comments_rows is not None,
+                }
+                span.measure(df)
+
+    return validation, result
@@ -0,0 +1,55 @@
+"""
+Extraction mode per member of a DDP, decided before anything is decompressed
+
+The central directory of the zip holds the decompressed size of every
+member. Members are extracted in full when they fit in memory, or when
+the extract function streams them and they are not too large to stream
+in full. Larger members are sampled (streamed up to SAMPLE_ROWS rows, the
+table is flagged as "sampled") or, when they cannot be streamed, skipped
+as if they were missing.
+"""
+import logging
+
+from port.tracking import Span
+from port.zipindex import MAX_READ_SIZE
+
+logger = logging.getLogger(__name__)
+
+FULL = "full"
+SAMPLED = "sampled"
+SKIPPED = "skipped"
+
+# Decompressed bytes up to which a member is streamed in full
+MAX_STREAMING_SIZE = 512 * 1024 * 1024
+
+# Rows streamed from a sampled member
+SAMPLE_ROWS = 100000
+
+
+def mode(size, streamable):
+    if streamable:
+        return FULL if size <= MAX_STREAMING_SIZE else SAMPLED
+    return FULL if size <= MAX_READ_SIZE else SKIPPED
+
+
+def plan(ddp, platform, members):
+    """
+    Mode per member for the members of the DDP an extract function reads
+
+    members maps the file names to whether the extract function can stream
+    them. Every decision other than FULL is logged.
+    """
+    modes = {}
+    with Span("preflight", platform=platform) as span:
+        for name, streamable in members.items():
+            size = ddp.size(name)
+            modes[name] = mode(size, streamable)
+            if modes[name] != FULL:
+                logger.warning("%s %s of %d bytes is extracted in %s mode", platform, name, size, modes[name])
+        span.set(modes=modes)
+    return modes
+
+
+def max_rows(member_mode):
+    """Rows to stream in member_mode, None for all"""
+    return SAMPLE_ROWS if member_mode == SAMPLED else None
@@ -0,0 +1,27 @@
+"""
+Progress of long running steps of the script
+
+A step that can take long is written as a generator: it yields the fraction
+of its work that is done (0 to 1) between chunks and returns its result.
+Steps can be nested with scaled, the script renders the progress between
+the chunks and the step is abandoned by closing the generator.
+"""
+
+
+def scaled(steps, start, end):
+    """Yield from the sub-step steps with its fractions mapped onto start..end, return its result"""
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        yield start + (end - start) * fraction
+
+
+def run(steps):
+    """Run a step to completion without reporting its progress, return its result"""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,106 @@
+import io
+import os
+
+# Bytes requested from a block source at a time
+BLOCK_SIZE = 1024 * 1024
+
+
+class BlockReader(io.RawIOBase):
+    """
+    Seekable binary file over a source that is read in blocks
+
+    read_block(offset, size) returns the size bytes at offset, e.g. a slice
+    of the File the participant selected, read by py_worker.js with
+    FileReaderSync. The upload is not copied into the Pyodide file system,
+    only the last block read is held in memory.
+    """
+
+    def __init__(self, read_block, size, name=None):
+        super().__init__()
+        self.read_block = read_block
+        self.size = size
+        self.name = name
+        self.position = 0
+        self.block = b""
+        self.block_offset = 0
+
+    def close(self):
+        # releases the File of the participant, see py_worker.js
+        self.read_block = None
+        self.block = b""
+        super().close()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.position = offset
+        return offset
+
+    def readinto(self, buffer):
+        if self.closed:
+            raise ValueError(f"I/O operation on closed file {self.name}")
+        # zipfile expects reads to be complete, so the buffer is filled up to the end of the source
+        view = memoryview(buffer).cast("B")
+        done = 0
+        while done < len(view) and self.position < self.size:
+            block = self._block()
+            start = self.position - self.block_offset
+            count = min(len(view) - done, len(block) - start)
+            view[done:done + count] = block[start:start + count]
+            done += count
+            self.position += count
+        return done
+
+    def _block(self):
+        if not 0 <= self.position - self.block_offset < len(self.block):
+            block = self.read_block(self.position, min(BLOCK_SIZE, self.size - self.position))
+            if hasattr(block, "to_py"):
+                # a Uint8Array from py_worker.js
+                block = block.to_py()
+            if not block:
+                raise OSError(f"Could not read {self.name} at offset {self.position}")
+            self.block = block
+            self.block_offset = self.position
+        return self.block
+
+
+def open_source(source):
+    """
+    What zipfile can open for a DDP source: a path, bytes or a seekable binary file object
+
+    The file objects, including BlockReaders, are owned by the caller and
+    are not closed with the zip.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+def source_size(source):
+    """Size of a DDP source in bytes, 0 if it is not known"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    if isinstance(source, BlockReader):
+        return source.size
+    try:
+        if hasattr(source, "seek"):
+            position = source.tell()
+            size = source.seek(0, io.SEEK_END)
+            source.seek(position)
+            return size
+        return os.path.getsize(source)
+    except (OSError, TypeError, ValueError):
+        return 0
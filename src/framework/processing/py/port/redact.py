@@ -0,0 +1,173 @@
+"""
+Redaction of the extracted tables before they are shown in the consent form
+
+Free text is scrubbed with one combined regular expression: e-mail
+addresses and phone numbers are replaced by a placeholder, URLs and
+@handles by a keyed hash of them. Columns that hold identifiers only
+(PSEUDONYMIZED_COLUMNS) are replaced by the keyed hash as a whole, as are
+those fields of the records in columns of lists of records, such as the
+subtitles (channel name and URL) of the JSON watch history. The
+hash is an HMAC with a key that only lives in this worker, so the same
+value gets the same pseudonym within a donation and cannot be looked up.
+
+Every string operation is done on the distinct values of a column only
+(the categories of a compacted column), then mapped back to the rows with
+their codes.
+"""
+import functools
+import hashlib
+import hmac
+import re
+import secrets
+
+import numpy as np
+import pandas as pd
+
+from port.tracking import Span
+
+# Columns (and fields of records, see redact_records) that only hold identifiers, replaced by their pseudonym.
+# The CSV files of a takeout are in the language of the participant, the names are listed in English and Dutch.
+PSEUDONYMIZED_COLUMNS = frozenset([
+    "Url", "url", "titleUrl",
+    "Channel Id", "Kanaal-ID",
+    "Channel Url", "Kanaal-URL",
+])
+
+# Hex digits of the HMAC kept in a pseudonym
+PSEUDONYM_LENGTH = 16
+
+# Values looked at to decide whether a column holds strings
+STRING_SAMPLE = 20
+
+PATTERN = re.compile(
+    r"(?P<email>[\w.+-]+@[\w-]+(?:\.[\w-]+)+)"
+    r"|(?P<url>\bhttps?://[^\s<>\"']+|\bwww\.[^\s<>\"']+)"
+    r"|(?P<handle>(?<![\w@])@\w[\w.]*\w)"
+    r"|(?P<phone>(?<![\w+])\+?\d(?:[ \-()]?\d){8,14}(?!\w))"
+)
+
+# Cheap test for text that PATTERN might match: an @, a URL or a run of four digits
+CANDIDATE = r"@|https?:|www\.|\d[ \-()]?\d[ \-()]?\d[ \-()]?\d"
+
+PLACEHOLDERS = {"email": "[email]", "phone": "[phone]"}
+
+KEY = secrets.token_bytes(32)
+
+
+@functools.lru_cache(maxsize=65536)
+def pseudonym(value):
+    return hmac.new(KEY, value.encode("utf-8"), hashlib.sha256).hexdigest()[:PSEUDONYM_LENGTH]
+
+
+def _replace(match):
+    kind = match.lastgroup
+    if kind == "url":
+        return f"[url:{pseudonym(match.group())}]"
+    if kind == "handle":
+        return f"@{pseudonym(match.group())}"
+    return PLACEHOLDERS[kind]
+
+
+def redact_text(values):
+    """Series of strings with e-mail addresses, phone numbers, URLs and handles redacted"""
+    # most text holds nothing to redact, the full pattern only runs on the candidates
+    candidates = values.str.contains(CANDIDATE, regex=True, na=False).to_numpy(dtype=bool)
+    out = values.copy()
+    out[candidates] = values[candidates].str.replace(PATTERN, _replace, regex=True)
+    return out
+
+
+def pseudonymize(values):
+    """Series of strings replaced by their keyed hash"""
+    return pd.Series([pseudonym(value) for value in values], index=values.index, dtype=object)
+
+
+def redact_records(values):
+    """
+    Series of lists of records with the string fields of the records redacted
+
+    The lists are factorized by their repr: the records of every distinct
+    list are redacted once, the rows with the same list share the redacted
+    copy of it.
+    """
+    codes, _ = pd.factorize(values.map(repr))
+    firsts = np.unique(codes, return_index=True)[1]
+    distinct = np.empty(len(firsts), dtype=object)
+    for code, row in enumerate(firsts):
+        distinct[code] = _redact_records(values.iat[row])
+    return pd.Series(distinct[codes], index=values.index, name=values.name, dtype=object)
+
+
+def redact(frame):
+    """Return frame with its string columns and columns of records redacted, other columns are left as they are"""
+    columns = {}
+    for name, column in frame.items():
+        if _is_strings(column):
+            fun = pseudonymize if name in PSEUDONYMIZED_COLUMNS else redact_text
+            column = _map_distinct(column, fun)
+        elif _is_records(column):
+            column = redact_records(column)
+        columns[name] = column
+    return pd.DataFrame(columns, columns=frame.columns, index=frame.index)
+
+
+def redact_result(platform, result):
+    """Redact the tables in an extraction result in place, lazy tables when they are built"""
+    for key, table in result.items():
+        data = table["data"]
+        if isinstance(data, pd.DataFrame):
+            table["data"] = _measured(platform, key, data)
+        else:
+            data.transform(lambda frame, key=key: _measured(platform, key, frame))
+    return result
+
+
+def _measured(platform, key, frame):
+    with Span("redact", platform=platform, table=key, rows=len(frame)):
+        return redact(frame)
+
+
+def _is_strings(column):
+    if not (column.dtype == object or isinstance(column.dtype, (pd.StringDtype, pd.CategoricalDtype))):
+        return False
+    sample = column.dropna().head(STRING_SAMPLE)
+    return len(sample) > 0 and all(isinstance(value, str) for value in sample)
+
+
+def _is_records(column):
+    if column.dtype != object:
+        return False
+    sample = column.dropna().head(STRING_SAMPLE)
+    return len(sample) > 0 and all(isinstance(value, list) for value in sample)
+
+
+def _redact_records(records):
+    if not isinstance(records, list):
+        return records
+    return [
+        {key: _redact_field(key, value) for key, value in record.items()} if isinstance(record, dict) else record
+        for record in records
+    ]
+
+
+def _redact_field(key, value):
+    if not isinstance(value, str):
+        return value
+    if key in PSEUDONYMIZED_COLUMNS:
+        return pseudonym(value)
+    return PATTERN.sub(_replace, value)
+
+
+def _map_distinct(column, fun):
+    """Apply fun to the distinct values of column only, a categorical column stays categorical"""
+    codes, uniques = pd.factorize(column)
+    if len(uniques) == 0:
+        return column
+    mapped = fun(pd.Series(np.asarray(uniques, dtype=object))).to_numpy(dtype=object)
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # distinct values can be redacted to the same text, the categories are made unique again
+        mapped_codes, categories = pd.factorize(mapped)
+        codes = np.where(codes >= 0, mapped_codes[codes], -1)
+        return pd.Series(pd.Categorical.from_codes(codes, categories), index=column.index, name=column.name)
+    values = np.where(codes >= 0, mapped[codes], None)
+    return pd.Series(values, index=column.index, name=column.name, dtype=object)
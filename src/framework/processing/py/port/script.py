@@ -1,24 +1,25 @@
+import functools
 import logging
 import json
-import io
-
-import pandas as pd
+import time
 
 import port.api.props as props
 from port.api.commands import (CommandSystemDonate, CommandUIRender)
 
-from ddpinspect import unzipddp
-from ddpinspect import twitter
-from ddpinspect import instagram
-from ddpinspect import youtube
-from ddpinspect import facebook
-from ddpinspect.validate import Language
-from ddpinspect.validate import DDPFiletype
+from port.zipindex import ZipIndex
+from port.reader import BlockReader
+from port.cache import ResultCache, result_size
+from port import donation
+from port import lazy
+from port.platforms import PLATFORMS
+from port.tracking import LogSink, Span, collect, memory
+from port.consent import TablePager, PAGE_SIZE, PAGING_THRESHOLD
+from port.preflight import SAMPLE_ROWS
 
-LOG_STREAM = io.StringIO()
+LOG_SINK = LogSink()
 
 logging.basicConfig(
-    stream=LOG_STREAM,
+    handlers=[LOG_SINK],
     level=logging.INFO,
     format="%(asctime)s --- %(name)s --- %(levelname)s --- %(message)s",
     datefmt="%Y-%m-%dT%H:%M:%S%z",
@@ -26,79 +27,15 @@ logging.basicConfig(
 
 LOGGER = logging.getLogger("yolo")
 
-TABLE_TITLES = {
-    "twitter_interests": props.Translatable(
-        {
-            "en": "Your interests according to Twitter:",
-            "nl": "Jouw interesses volgens Twitter:",
-        }
-    ),
-    "twitter_account_created_at": props.Translatable(
-        {
-            "en": "Date of your account creation on Twitter:",
-            "nl": "Datum waarop je account is aangemaakt op Twitter:",
-        }
-    ),
-    "instagram_your_topics": props.Translatable(
-        {
-            "en": "Topics in which you are interested in according to Instagram:",
-            "nl": "Onderwerpen waar jij volgens Instagram geintereseerd in bent:",
-        }
-    ),
-    "instagram_interests": props.Translatable(
-        {
-            "en": "Your interests according to Instagram:",
-            "nl": "Jouw interesses volgens Instagram:",
-        }
-    ),
-    "instagram_account_created_at": props.Translatable(
-        {
-            "en": "Date of your account creation on Instagram:",
-            "nl": "Datum waarop je account is aangemaakt op Instagram:",
-        }
-    ),
-    "facebook_your_topics": props.Translatable(
-        {
-            "en": "Topics in which you are interested in according to Facebook:",
-            "nl": "Onderwerpen waar jij volgens Facebook geintereseerd in bent:",
-        }
-    ),
-    "facebook_interests": props.Translatable(
-        {
-            "en": "Your interests according to Facebook:",
-            "nl": "Jouw interesses volgens Facebook:",
-        }
-    ),
-    "facebook_account_created_at": props.Translatable(
-        {
-            "en": "Date of your account creation on Facebook:",
-            "nl": "Datum waarop je account is aangemaakt op Facebook:",
-        }
-    ),
-    "youtube_watch_history": props.Translatable(
-        {
-            "en": "Videos you watched on YouTube:",
-            "nl": "Videos die je op YouTube hebt gekeken:",
-        }
-    ),
-    "youtube_subscriptions": props.Translatable(
-        {
-            "en": "Channels you are subscribed to on Youtube:",
-            "nl": "Kanalen waarop je geabboneerd bent op Youtube:",
-        }
-    ),
-    "youtube_comments": props.Translatable(
-        {
-            "en": "Comments you posted on Youtube:",
-            "nl": "Reacties die je hebt geplaats op Youtube:",
-        }
-    ),
-    "empty_result_set": props.Translatable(
-        {
-            "en": "We could not extract any data:",
-            "nl": "We konden de gegevens niet in je donatie vinden:",
-        }
-    ),
+# Seconds between the progress updates during an extraction
+PROGRESS_INTERVAL = 0.5
+
+PROGRESS_CANCEL = props.Translatable({"en": "Cancel", "nl": "Annuleren"})
+
+# Added to the title of a table of which only a sample was extracted, see port.preflight
+SAMPLED_NOTE = {
+    "en": "(only the first {rows} rows, the file is too large to read in full)",
+    "nl": "(alleen de eerste {rows} rijen, het bestand is te groot om helemaal te lezen)",
 }
 
 
@@ -106,247 +43,237 @@ def process(sessionId):
     LOGGER.info("Starting the donation flow")
     yield donate_logs(f"{sessionId}-tracking")
 
-    platforms = [
-        ("Twitter", extract_twitter),
-        ("Instagram", extract_instagram),
-        ("Facebook", extract_facebook),
-        ("YouTube", extract_youtube),
-    ]
-
     # progress in %
-    subflows = len(platforms)
+    subflows = len(PLATFORMS)
     steps = 2
     step_percentage = (100 / subflows) / steps
-    progress = 0
-
-    for platform in platforms:
-        platform_name, extraction_fun = platform
-        data = None
-
-        # STEP 1: select the file
-        progress += step_percentage
-        while True:
-            LOGGER.info("Prompt for file for %s", platform_name)
-            yield donate_logs(f"{sessionId}-tracking")
 
-            promptFile = prompt_file("application/zip, text/plain", platform_name)
-            fileResult = yield render_donation_page(platform_name, promptFile, progress)
+    for index, platform in enumerate(PLATFORMS):
+        before = yield from process_platform(sessionId, platform, index * steps * step_percentage, step_percentage)
+        # the tables of the platform are unreachable now that its generator has returned
+        collect("cleanup", before, platform=platform.name)
 
-            if fileResult.__type__ == "PayloadString":
-                validation, extractionResult = extraction_fun(fileResult.value)
-
-                # Flow: Three paths
-                # 1: Extracted result: continue
-                # 2: No extracted result: valid package, generated empty df: continue
-                # 3: No extracted result: not a valid package, retry loop
+    # the spans of the last steps
+    yield donate_logs(f"{sessionId}-tracking")
+    yield render_end_page()
 
-                if extractionResult:
-                    LOGGER.info("Payload for %s", platform_name)
-                    yield donate_logs(f"{sessionId}-tracking")
-                    data = extractionResult
-                    break
-                elif (validation.status_code.id == 0 and not extractionResult and validation.ddp_category is not None):
-                    LOGGER.info("Valid zip for %s; No payload", platform_name)
-                    yield donate_logs(f"{sessionId}-tracking")
-                    data = return_empty_result_set()
-                    break
-                elif validation.ddp_category is None:
-                    LOGGER.info("Not a valid %s zip; No payload; prompt retry_confirmation", platform_name)
-                    yield donate_logs(f"{sessionId}-tracking")
-                    retry_result = yield render_donation_page(platform_name, retry_confirmation(platform_name), progress)
 
-                    if retry_result.__type__ == "PayloadTrue":
-                        continue
-                    else:
-                        LOGGER.info("Skipped during retry %s", platform_name)
-                        yield donate_logs(f"{sessionId}-tracking")
-                        #data = return_empty_result_set()
-                        break
+def process_platform(sessionId, platform, progress, step_percentage):
+    """
+    Donation flow of one platform, returns the memory() before its tables and files are released
+
+    Everything the platform holds (extraction results, the consent form and
+    the upload) lives in the locals of this generator and is released when
+    it returns.
+    """
+    platform_name = platform.name
+    data = None
+    ddp = None
+    results = ResultCache()
+
+    # STEP 1: select the file
+    progress += step_percentage
+    while True:
+        LOGGER.info("Prompt for file for %s", platform_name)
+        yield donate_logs(f"{sessionId}-tracking")
+
+        promptFile = prompt_file("application/zip, text/plain", platform_name)
+        fileResult = yield render_donation_page(platform_name, promptFile, progress)
+
+        if fileResult.__type__ in ("PayloadString", "PayloadFile"):
+            close_index(ddp, results)
+            # kept open until the platform is done, lazy tables read from it when they are needed
+            ddp = ZipIndex(file_source(fileResult))
+            cached = results.get(ddp.fingerprint())
+            if cached is not None:
+                LOGGER.info("Same file as before for %s", platform_name)
+                close_index(ddp, results)
+                # the lazy tables of the cached result read from the index and upload they were extracted from
+                ddp, validation, extractionResult = cached
             else:
-                LOGGER.info("Skipped %s", platform_name)
+                # the span includes the time the progress is shown
+                with Span("extract", platform=platform_name, input_bytes=ddp.archive_size()) as span:
+                    steps = platform.extract_steps(ddp)
+                    extraction = yield from render_progress(platform_name, steps, progress, step_percentage)
+                    if extraction is None:
+                        span.set(cancelled=True)
+                    else:
+                        span.set(tables=len(extraction[1]), valid=extraction[0].ddp_category is not None)
+                if extraction is None:
+                    LOGGER.info("Extraction cancelled for %s", platform_name)
+                    yield donate_logs(f"{sessionId}-tracking")
+                    continue
+                validation, extractionResult = extraction
+                entry = (ddp, validation, extractionResult)
+                for evicted_ddp, _, _ in results.put(ddp.fingerprint(), entry, result_size(extractionResult)):
+                    close_index(evicted_ddp, results)
+
+            # Flow: Three paths
+            # 1: Extracted result: continue
+            # 2: No extracted result: valid package, generated empty df: continue
+            # 3: No extracted result: not a valid package, retry loop
+
+            if extractionResult:
+                LOGGER.info("Payload for %s", platform_name)
                 yield donate_logs(f"{sessionId}-tracking")
+                data = extractionResult
                 break
-
-        # STEP 2: ask for consent
-        progress += step_percentage
-
-        if data is not None:
-            LOGGER.info("Prompt consent; %s", platform_name)
-            yield donate_logs(f"{sessionId}-tracking")
-            prompt = prompt_consent(platform_name, data)
-            consent_result = yield render_donation_page(platform_name, prompt, progress)
-
-            if consent_result.__type__ == "PayloadJSON":
-                LOGGER.info("Data donated; %s", platform_name)
+            elif (validation.status_code.id == 0 and not extractionResult and validation.ddp_category is not None):
+                LOGGER.info("Valid zip for %s; No payload", platform_name)
                 yield donate_logs(f"{sessionId}-tracking")
-                yield donate(platform_name, consent_result.value)
-            else:
-                LOGGER.info("Skipped ater reviewing consent: %s", platform_name)
+                data = platform.empty_result()
+                break
+            elif validation.ddp_category is None:
+                LOGGER.info("Not a valid %s zip; No payload; prompt retry_confirmation", platform_name)
                 yield donate_logs(f"{sessionId}-tracking")
+                retry_result = yield render_donation_page(platform_name, retry_confirmation(platform_name), progress)
 
-    yield render_end_page()
+                if retry_result.__type__ == "PayloadTrue":
+                    continue
+                else:
+                    LOGGER.info("Skipped during retry %s", platform_name)
+                    yield donate_logs(f"{sessionId}-tracking")
+                    #data = return_empty_result_set()
+                    break
+        else:
+            LOGGER.info("Skipped %s", platform_name)
+            yield donate_logs(f"{sessionId}-tracking")
+            break
+
+    # STEP 2: ask for consent
+    progress += step_percentage
+
+    if data is not None:
+        LOGGER.info("Prompt consent; %s", platform_name)
+        yield donate_logs(f"{sessionId}-tracking")
+        with Span("consent_form", platform=platform_name) as span:
+            prompt, sources = prompt_consent(platform_name, data)
+            span.set(rows=sum(table.total_rows() for table in prompt.tables), lazy=len(sources))
+        sampled = [f"{platform_name}_{k}" for k, v in data.items() if v.get("sampled")]
+        pager = TablePager(prompt, sources, sampled)
+        consent_result = yield render_donation_page(platform_name, prompt, progress)
+
+        # the UI requests further pages of large tables while the participant reviews them
+        while consent_result.__type__ == "PayloadTablePageRequest":
+            consent_result = yield pager.page(consent_result.value)
+
+        if consent_result.__type__ == "PayloadJSON":
+            LOGGER.info("Data donated; %s", platform_name)
+            yield donate_logs(f"{sessionId}-tracking")
+            # the tables are serialized a chunk at a time while they are donated
+            with Span("donate", platform=platform_name) as span:
+                size = yield from donation.donate(platform_name, pager.fragments(consent_result.value))
+                span.set(serialized_bytes=size)
+        else:
+            LOGGER.info("Skipped ater reviewing consent: %s", platform_name)
+            yield donate_logs(f"{sessionId}-tracking")
+
+    # STEP 3: release the tables and the upload
+    before = memory()
+    release(ddp, results)
+    return before
 
 
 ##################################################################
 # helper functions
 
+def release(ddp, results):
+    """Close the DDP indexes of a platform, release the uploads they read from and drop the cached results"""
+    indexes = [ddp] + [cached_ddp for cached_ddp, _, _ in results.values()]
+    results.clear()
+    for index in indexes:
+        close_index(index, results)
+
+
+def close_index(ddp, results):
+    """Close ddp and release the upload it reads from, unless a cached result still reads from them"""
+    if ddp is None or any(ddp is cached_ddp for cached_ddp, _, _ in results.values()):
+        return
+    ddp.close()
+    # paths are not removed, they are files of the host (see run_batch), not copies of an upload
+    if isinstance(ddp.source, BlockReader):
+        ddp.source.close()
+
+
+def file_source(file_result):
+    """
+    Source of the DDP the participant selected, see ZipIndex
+
+    PayloadString holds a path, PayloadFile the name, size and
+    readBlock(offset, size) of the upload, which py_worker.js reads in
+    blocks without copying it into the Pyodide file system.
+    """
+    if file_result.__type__ == "PayloadString":
+        return file_result.value
+    file = file_result.value
+    return BlockReader(file.readBlock, int(file.size), file.name)
+
+
 def prompt_consent(platform_name, data):
     table_list = []
+    sources = {}
 
     for k, v in data.items():
+        table_id = f"{platform_name}_{k}"
         df = v["data"]
-        table = props.PropsUIPromptConsentFormTable(f"{platform_name}_{k}", v["title"], df)
-        table_list.append(table)
+        row_count = None
+
+        if isinstance(df, lazy.LazyTable):
+            if df.estimated_count > PAGING_THRESHOLD:
+                # render the preview, the full table is only built when it is needed
+                sources[table_id] = df.frame
+                row_count = df.estimated_count
+                df = df.preview
+            else:
+                df = df.frame()
 
-    return props.PropsUIPromptConsentForm(table_list, [])
+        title = sampled_title(v["title"]) if v.get("sampled") else v["title"]
+        page_size = PAGE_SIZE if (row_count or len(df)) > PAGING_THRESHOLD else None
+        table = props.PropsUIPromptConsentFormTable(table_id, title, df, page_size, row_count=row_count)
+        table_list.append(table)
 
+    return props.PropsUIPromptConsentForm(table_list, []), sources
 
-def return_empty_result_set():
-    result = {}
 
-    df = pd.DataFrame(["No data found"], columns=["No data found"])
-    result["empty"] = {"data": df, "title": TABLE_TITLES["empty_result_set"]}
+def sampled_title(title):
+    """Title of a table of which only a sample was extracted"""
+    rows = {"en": f"{SAMPLE_ROWS:,}", "nl": f"{SAMPLE_ROWS:,}".replace(",", ".")}
+    return props.Translatable({
+        locale: f"{text} {SAMPLED_NOTE[locale].format(rows=rows[locale])}" if locale in SAMPLED_NOTE else text
+        for locale, text in title.translations.items()
+    })
 
-    return result
 
+def render_progress(platform_name, steps, progress, step_percentage):
+    """
+    Run the step steps (see port.progress), rendering its progress between chunks
 
-def donate_logs(key):
-    log_string = LOG_STREAM.getvalue()  # read the log stream
+    The progress is rendered at most every PROGRESS_INTERVAL seconds, and
+    not at all when the step finishes within that time. Returns the result
+    of the step, None when the participant cancels it.
+    """
+    rendered = time.monotonic()
+    while True:
+        try:
+            fraction = next(steps)
+        except StopIteration as stop:
+            return stop.value
 
-    if log_string:
-        log_data = log_string.split("\n")
-    else:
-        log_data = ["no logs"]
+        if time.monotonic() - rendered < PROGRESS_INTERVAL:
+            continue
 
-    return donate(key, json.dumps(log_data))
+        body = prompt_progress(platform_name, round(fraction * 100))
+        result = yield render_donation_page(platform_name, body, progress + fraction * step_percentage)
+        if result.__type__ == "PayloadFalse":
+            steps.close()
+            return None
+        rendered = time.monotonic()
 
 
-##################################################################
-# Extraction functions
-
-def extract_twitter(twitter_zip):
-    result = {}
-
-    validation = twitter.validate_zip(twitter_zip)
-
-    interests_bytes = unzipddp.extract_file_from_zip(twitter_zip, "personalization.js")
-    interests_listdict = twitter.bytesio_to_listdict(interests_bytes)
-    interests = twitter.interests_to_list(interests_listdict)
-
-    if interests:
-        df = pd.DataFrame(interests, columns=["Interests"])
-        result["interests"] = {"data": df, "title": TABLE_TITLES["twitter_interests"]}
- 
-    account_created_at_bytes = unzipddp.extract_file_from_zip(twitter_zip, "account.js")  
-    account_created_at_listdict = twitter.bytesio_to_listdict(account_created_at_bytes)
-    account_created_at = twitter.account_created_at_to_list(account_created_at_listdict)
-
-    if account_created_at:
-        df = pd.DataFrame(account_created_at, columns=["Account created at"])
-        result["account_created_at"] = {"data": df, "title": TABLE_TITLES["twitter_account_created_at"]}
-
-    return validation, result
-
-
-def extract_instagram(instagram_zip):
-    result = {}
-
-    validation = instagram.validate_zip(instagram_zip)
-
-    interests_bytes = unzipddp.extract_file_from_zip(instagram_zip, "ads_interests.json")
-    interests_dict = unzipddp.read_json_from_bytes(interests_bytes)
-    interests = instagram.interests_to_list(interests_dict)
-    if interests:
-        df = pd.DataFrame(interests, columns=["Interests"])
-        result["interests"] = {"data": df, "title": TABLE_TITLES["instagram_interests"]}
-
-    your_topics_bytes = unzipddp.extract_file_from_zip(instagram_zip, "your_topics.json")
-    your_topics_dict = unzipddp.read_json_from_bytes(your_topics_bytes)
-    your_topics = instagram.your_topics_to_list(your_topics_dict)
-    if your_topics:
-        df = pd.DataFrame(your_topics, columns=["Your Topics"])
-        result["your_topics"] = {"data": df, "title": TABLE_TITLES["instagram_your_topics"]}
-  
-    account_created_at_bytes = unzipddp.extract_file_from_zip(instagram_zip, "signup_information.json")
-    account_created_at_dict = unzipddp.read_json_from_bytes(account_created_at_bytes)
-    account_created_at = instagram.account_created_at_to_list(account_created_at_dict)
-    if account_created_at:
-        df = pd.DataFrame(account_created_at, columns=["Account created at"])
-        result["account_created_at"] = {"data": df, "title": TABLE_TITLES["instagram_account_created_at"]}
-
-    return validation, result
-
-
-def extract_facebook(facebook_zip):
-    result = {}
-
-    validation = facebook.validate_zip(facebook_zip)
-
-    interests_bytes = unzipddp.extract_file_from_zip(facebook_zip, "ads_interests.json")
-    interests_dict = unzipddp.read_json_from_bytes(interests_bytes)
-    interests = facebook.interests_to_list(interests_dict)
-    if interests:
-        df = pd.DataFrame(interests, columns=["Interests"])
-        result["interests"] = {"data": df, "title": TABLE_TITLES["facebook_interests"]}
-
-    your_topics_bytes = unzipddp.extract_file_from_zip(facebook_zip, "your_topics.json")
-    your_topics_dict = unzipddp.read_json_from_bytes(your_topics_bytes)
-    your_topics = facebook.your_topics_to_list(your_topics_dict)
-    if your_topics:
-        df = pd.DataFrame(your_topics, columns=["Your Topics"])
-        result["your_topics"] = {"data": df, "title": TABLE_TITLES["facebook_your_topics"]}
-
-    account_created_at_bytes = unzipddp.extract_file_from_zip(facebook_zip, "profile_information.json")
-    account_created_at_dict = unzipddp.read_json_from_bytes(account_created_at_bytes)
-    account_created_at = facebook.account_created_at_to_list(account_created_at_dict)
-    if account_created_at:
-        df = pd.DataFrame(account_created_at, columns=["Account created at"])
-        result["account_created_at"] = {"data": df, "title": TABLE_TITLES["facebook_account_created_at"]}
-
-    return validation, result
-
-
-def extract_youtube(youtube_zip):
-    result = {}
-
-    validation = youtube.validate_zip(youtube_zip)
-    if validation.ddp_category is not None:
-        if validation.ddp_category.language == Language.EN:
-            subscriptions_fn = "subscriptions.csv"
-            watch_history_fn = "watch-history"
-            comments_fn = "my-comments.html"
-        else:
-            subscriptions_fn = "abonnementen.csv"
-            watch_history_fn = "kijkgeschiedenis"
-            comments_fn = "mijn-reacties.html"
-
-        # Get subscriptions
-        subscriptions_bytes = unzipddp.extract_file_from_zip( youtube_zip, subscriptions_fn)
-        subscriptions_listdict = unzipddp.read_csv_from_bytes(subscriptions_bytes)
-        df = youtube.to_df(subscriptions_listdict)
-        if not df.empty:
-            result["subscriptions"] = {"data": df, "title": TABLE_TITLES["youtube_subscriptions"]}
-        
-        # Get watch history
-        if validation.ddp_category.ddp_filetype == DDPFiletype.JSON:
-            watch_history_fn = watch_history_fn + ".json"
-            watch_history_bytes = unzipddp.extract_file_from_zip(youtube_zip, watch_history_fn)
-            watch_history_listdict = unzipddp.read_json_from_bytes(watch_history_bytes)
-            df = youtube.to_df(watch_history_listdict)
-        if validation.ddp_category.ddp_filetype == DDPFiletype.HTML:
-            watch_history_fn = watch_history_fn + ".html"
-            watch_history_bytes = unzipddp.extract_file_from_zip(youtube_zip, watch_history_fn)
-            df = youtube.watch_history_html_to_df(watch_history_bytes)
-        if not df.empty:
-            result["watch_history"] = {"data": df, "title": TABLE_TITLES["youtube_watch_history"]}
-
-        # Get comments
-        comments_bytes = unzipddp.extract_file_from_zip(youtube_zip, comments_fn)
-        df = youtube.comments_to_df(comments_bytes)
-        if not df.empty:
-            result["comments"] = { "data": df, "title": TABLE_TITLES["youtube_comments"]}
-
-    return validation, result
+def donate_logs(key):
+    # only the records since the previous donation, the receiver orders them on "seq"
+    log_data = LOG_SINK.drain()
+    return donate(key, json.dumps(log_data))
 
 
 ##########################################
@@ -358,13 +285,20 @@ def render_end_page():
 
 
 def render_donation_page(platform, body, progress):
-    header = props.PropsUIHeader(props.Translatable({"en": platform, "nl": platform}))
+    header = render_header(platform)
 
     footer = props.PropsUIFooter(progress)
     page = props.PropsUIPageDonation(platform, header, body, footer)
     return CommandUIRender(page)
 
 
+@functools.lru_cache(maxsize=None)
+def render_header(platform):
+    # the same header object for every page of a platform, so it is serialized once
+    return props.PropsUIHeader(props.Translatable({"en": platform, "nl": platform}))
+
+
+@functools.lru_cache(maxsize=None)
 def retry_confirmation(platform):
     text = props.Translatable(
         {
@@ -377,6 +311,7 @@ def retry_confirmation(platform):
     return props.PropsUIPromptConfirm(text, ok, cancel)
 
 
+@functools.lru_cache(maxsize=None)
 def prompt_file(extensions, platform):
     description = props.Translatable(
         {
@@ -387,5 +322,15 @@ def prompt_file(extensions, platform):
     return props.PropsUIPromptFileInput(description, extensions)
 
 
+def prompt_progress(platform, percentage):
+    description = props.Translatable(
+        {
+            "en": f"One moment please, we are extracting the data from your {platform} file.",
+            "nl": f"Een moment geduld, we halen de gegevens uit uw {platform} bestand."
+        }
+    )
+    return props.PropsUIPromptProgress(description, percentage, PROGRESS_CANCEL)
+
+
 def donate(key, json_string):
     return CommandSystemDonate(key, json_string)
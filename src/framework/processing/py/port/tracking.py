@@ -0,0 +1,165 @@
+import gc
+import logging
+import os
+import sys
+import time
+from collections import deque
+
+try:
+    import resource
+except ImportError:
+    # not available in Pyodide
+    resource = None
+
+try:
+    import pyodide_js
+except ImportError:
+    # outside Pyodide
+    pyodide_js = None
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of log records kept between two donations
+LOG_CAPACITY = 1000
+
+
+class LogSink(logging.Handler):
+    """
+    Logging handler that keeps the records that have not been donated yet
+
+    Every record gets a sequence number, drain() returns the records since
+    the previous drain. The buffer is a ring buffer: when it is full the
+    oldest records are dropped, which shows up as a gap in the sequence
+    numbers on the receiving side.
+    """
+
+    def __init__(self, capacity=LOG_CAPACITY):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.seq = 0
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        entry = {"seq": self.seq, "message": message}
+        span = getattr(record, "span", None)
+        if span is not None:
+            entry["span"] = span
+        self.records.append(entry)
+        self.seq += 1
+
+    def drain(self):
+        self.acquire()
+        try:
+            records = list(self.records)
+            self.records.clear()
+        finally:
+            self.release()
+        return records
+
+
+class Span:
+    """
+    Times a step of the donation flow and logs it as a structured record
+
+    Used as a context manager, fields describing the step (platform, rows,
+    input_bytes, ...) are passed on creation or added with set() and
+    measure() while the step runs. On exit the step is logged with its
+    duration in seconds, the LogSink donates it under "span".
+    """
+
+    __slots__ = "name", "fields", "start"
+
+    def __init__(self, name, **fields):
+        self.name = name
+        self.fields = fields
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record = {"name": self.name, "seconds": round(time.perf_counter() - self.start, 6)}
+        record.update(self.fields)
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        rss = max_rss()
+        if rss is not None:
+            record["max_rss"] = rss
+        logger.info("Span %s took %.3f s", self.name, record["seconds"], extra={"span": record})
+        return False
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def measure(self, *frames):
+        """Add the row count and the (shallow) memory usage of the DataFrames produced by the step"""
+        frames = [frame for frame in frames if frame is not None]
+        self.fields["rows"] = self.fields.get("rows", 0) + sum(len(frame) for frame in frames)
+        self.fields["frame_bytes"] = self.fields.get("frame_bytes", 0) + sum(
+            int(frame.memory_usage(index=True).sum()) for frame in frames
+        )
+
+
+def max_rss():
+    """Peak resident memory of the process in bytes, None where it is not known"""
+    if resource is None:
+        return None
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def heap_size():
+    """
+    Resident memory of the process in bytes, None where it is not known
+
+    It is not known in Pyodide: the WebAssembly memory only ever grows, see
+    heap_peak(). allocated_blocks() is known everywhere.
+    """
+    if pyodide_js is not None:
+        return None
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def heap_peak():
+    """Size of the WebAssembly memory in Pyodide in bytes, its high-water mark: it never shrinks. None elsewhere"""
+    if pyodide_js is None:
+        return None
+    return int(pyodide_js._module.HEAPU8.length)
+
+
+def allocated_blocks():
+    """Number of memory blocks of Python objects, goes down when objects are released, in Pyodide too"""
+    return sys.getallocatedblocks()
+
+
+def memory():
+    """Measures of the memory in use that go down when memory is released, by span field name"""
+    return {"heap": heap_size(), "allocated_blocks": allocated_blocks()}
+
+
+def collect(name, before=None, **fields):
+    """
+    Collect garbage, logged as a span with the memory() before and after
+
+    before is measured by the caller before it drops its references, by
+    default it is measured here. In Pyodide the span also holds heap_peak.
+    """
+    if before is None:
+        before = memory()
+    fields.update({f"{measure}_before": value for measure, value in before.items()})
+    with Span(name, **fields) as span:
+        span.set(unreachable=gc.collect())
+        span.set(**{f"{measure}_after": value for measure, value in memory().items()})
+        peak = heap_peak()
+        if peak is not None:
+            span.set(heap_peak=peak)
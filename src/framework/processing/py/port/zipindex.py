@@ -0,0 +1,169 @@
+import hashlib
+import io
+import logging
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+
+from port import reader
+
+logger = logging.getLogger(__name__)
+
+# Suffixes ddpinspect takes into account when inferring the DDP category
+VALIDATION_SUFFIXES = (".json", ".csv", ".html", ".js")
+
+# Decompressed members are kept around so that repeated reads are free,
+# members larger than this budget are never cached
+MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+# Members larger than this are never decompressed into memory at once, they
+# can only be streamed with open, see port.preflight
+MAX_READ_SIZE = 256 * 1024 * 1024
+
+
+class ZipIndex:
+    """
+    Index over a single uploaded DDP zip
+
+    The central directory is scanned once when the index is created,
+    validation and all extraction steps look up members by file name
+    through the index instead of reopening the zip. Closing the index only
+    releases the file, it is reopened when a member is read again.
+
+    source is a path, the bytes of the zip or a seekable binary file object
+    such as a port.reader.BlockReader over the upload.
+    """
+
+    __slots__ = "source", "zip_file", "members", "digest", "cache", "cache_size", "max_cache_size"
+
+    def __init__(self, source, max_cache_size=MAX_CACHE_SIZE):
+        self.source = source
+        self.zip_file = None
+        self.members = {}
+        self.digest = None
+        self.cache = OrderedDict()
+        self.cache_size = 0
+        self.max_cache_size = max_cache_size
+
+        try:
+            self.zip_file = zipfile.ZipFile(reader.open_source(source), "r")
+        except zipfile.BadZipFile as e:
+            logger.error("BadZipFile:  %s", e)
+            return
+        except Exception as e:
+            logger.error("Exception was caught:  %s", e)
+            return
+
+        # Same semantics as unzipddp.extract_file_from_zip: first match on file name wins
+        digest = hashlib.sha256()
+        for info in self.zip_file.infolist():
+            name = Path(info.filename).name
+            if name and not info.is_dir() and name not in self.members:
+                self.members[name] = info
+            digest.update(f"{info.filename}\0{info.CRC}\0{info.file_size}\0{info.date_time}\n".encode("utf-8"))
+        self.digest = digest.hexdigest()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self.members
+
+    def close(self):
+        self.cache.clear()
+        self.cache_size = 0
+        if self.zip_file is not None:
+            self.zip_file.close()
+            self.zip_file = None
+
+    def is_zip(self):
+        return self.digest is not None
+
+    def fingerprint(self):
+        """
+        Hash over the central directory: names, CRCs, sizes and timestamps of all members
+
+        Equal fingerprints mean the same DDP without reading the members,
+        None if the file is not a zip.
+        """
+        return self.digest
+
+    def _zip(self):
+        if self.zip_file is None:
+            self.zip_file = zipfile.ZipFile(reader.open_source(self.source), "r")
+        return self.zip_file
+
+    def names(self):
+        return list(self.members)
+
+    def validate(self, platform):
+        """Validate the DDP against a ddpinspect platform module without rescanning the zip"""
+        # imported with the platform module, importing port does not load ddpinspect
+        from ddpinspect.validate import ValidateInput
+
+        validation = ValidateInput(platform.STATUS_CODES, platform.DDP_CATEGORIES)
+
+        if self.is_zip():
+            paths = [name for name in self.members if Path(name).suffix in VALIDATION_SUFFIXES]
+            validation.infer_ddp_category(paths)
+
+        if validation.ddp_category is None:
+            validation.set_status_code(1)
+        else:
+            validation.set_status_code(0)
+
+        return validation
+
+    def archive_size(self):
+        """Size of the zip in bytes, 0 if it is not known"""
+        return reader.source_size(self.source)
+
+    def size(self, name):
+        """Decompressed size of the member in bytes, 0 if the member does not exist"""
+        info = self.members.get(name)
+        return 0 if info is None else info.file_size
+
+    def read(self, name):
+        """Return the decompressed member as io.BytesIO, empty if the member does not exist or is too large"""
+        data = self.cache.get(name)
+        if data is not None:
+            self.cache.move_to_end(name)
+            return io.BytesIO(data)
+
+        info = self.members.get(name)
+        if info is None:
+            return io.BytesIO()
+        if info.file_size > MAX_READ_SIZE:
+            logger.error("Not reading %s of %d bytes into memory", name, info.file_size)
+            return io.BytesIO()
+
+        try:
+            data = self._zip().read(info)
+        except Exception as e:
+            logger.error("Exception was caught:  %s", e)
+            return io.BytesIO()
+
+        self._cache(name, data)
+        return io.BytesIO(data)
+
+    def open(self, name):
+        """Return a streaming file object for the member, None if the member does not exist"""
+        info = self.members.get(name)
+        if info is None:
+            return None
+        return self._zip().open(info)
+
+    def _cache(self, name, data):
+        size = len(data)
+        if size > self.max_cache_size:
+            return
+
+        while self.cache and self.cache_size + size > self.max_cache_size:
+            _, evicted = self.cache.popitem(last=False)
+            self.cache_size -= len(evicted)
+
+        self.cache[name] = data
+        self.cache_size += size
@@ -0,0 +1,82 @@
+import pandas as pd
+
+from port import aggregate
+from port import script
+from port.lazy import LazyTable
+
+CHANNELS = ["a", "a", "b", "a"]
+
+JSON_TIMES = ["2022-12-30T12:38:33.000Z", "2022-12-31T23:10:00.000Z", "2023-01-02T00:00:01.000Z", "garbage"]
+EN_DATES = [
+    "Dec 30, 2022, 12:38:33 PM CET",
+    "Dec 31, 2022, 11:10:00 PM CET",
+    "Jan 2, 2023, 12:00:01 AM CET",
+    "garbage",
+]
+NL_DATES = ["30 dec 2022, 12:38:33 CET", "31 dec 2022, 23:10:00 CET", "2 jan 2023, 00:00:01 CET", "garbage"]
+
+
+def html_history(dates, channels=CHANNELS):
+    return pd.DataFrame({"Title": ["t"] * len(dates), "Channel": channels, "Date": dates})
+
+
+def test_json_history():
+    frame = pd.DataFrame({"subtitles": [[{"name": channel, "url": "u"}] for channel in CHANNELS], "time": JSON_TIMES})
+    assert aggregate.views_per_channel(frame).to_dict("records") == [
+        {"Channel": "a", "Views": 3},
+        {"Channel": "b", "Views": 1},
+    ]
+    assert aggregate.views_per_channel_per_day(frame).to_dict("records") == [
+        {"Channel": "a", "Day": "2022-12-30", "Views": 1},
+        {"Channel": "a", "Day": "2022-12-31", "Views": 1},
+        {"Channel": "b", "Day": "2023-01-02", "Views": 1},
+    ]
+
+
+def test_english_and_dutch_html_dates_give_the_same_aggregates():
+    for view in aggregate.VIEWS.values():
+        en = view(html_history(EN_DATES))
+        nl = view(html_history(NL_DATES))
+        assert en.to_dict("records") == nl.to_dict("records")
+
+    assert aggregate.views_per_channel_per_week(html_history(NL_DATES)).to_dict("records") == [
+        {"Channel": "a", "Week": "2022-12-26", "Views": 2},
+        {"Channel": "b", "Week": "2023-01-02", "Views": 1},
+    ]
+
+
+def test_twelve_am_is_midnight():
+    out = aggregate.timestamps(html_history(EN_DATES))
+    assert out[0].hour == 12
+    assert out[2].hour == 0
+    assert out.isna().tolist() == [False, False, False, True]
+
+
+def test_undated_history():
+    assert not aggregate.has_timestamps(html_history(["unknown"] * 4))
+    assert aggregate.has_timestamps(html_history(NL_DATES))
+
+
+def test_aggregates_count_the_full_table_not_its_preview():
+    # the preview only has views of channel a, the table has 5000 views of a and b each
+    history = LazyTable(
+        lambda: html_history(EN_DATES[:2] * 5000, ["a", "b"] * 5000),
+        html_history(EN_DATES[:2] * 50, ["a"] * 100),
+        10000,
+    )
+    views = aggregate.of_table(history, ["per_channel", "per_channel_per_day"])
+    assert views["per_channel"].to_dict("records") == [
+        {"Channel": "a", "Views": 5000},
+        {"Channel": "b", "Views": 5000},
+    ]
+    assert len(views["per_channel_per_day"]) == 2
+
+    form, sources = script.prompt_consent("YouTube", {"per_channel": {"data": views["per_channel"], "title": "V"}})
+    assert not sources
+    assert form.tables[0].data_frame.to_dict("records") == views["per_channel"].to_dict("records")
+
+
+def test_aggregates_per_period_of_an_undated_table_are_left_out():
+    history = LazyTable(lambda: html_history(["unknown"] * 4), html_history(["unknown"] * 4), 4)
+    assert list(aggregate.of_table(history, list(aggregate.VIEWS))) == ["per_channel"]
+    assert aggregate.of_table(history, []) == {}
@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+
+from port import compact
+from port.lazy import LazyTable
+
+TIMES = ["2022-01-01T10:00:00Z", "2022-01-01T11:00:00.000+01:00", None, "2022-01-02 08:30:00"]
+
+
+def test_iso_timestamps_become_utc_datetimes():
+    out = compact.compact(pd.DataFrame({"time": TIMES}))
+    assert str(out["time"].dtype).startswith("datetime64") and str(out["time"].dt.tz) == "UTC"
+    # the offset is applied, the donated timestamps are in UTC
+    records = json.loads(out.to_json(orient="records", date_format="iso"))
+    assert [record["time"] for record in records] == [
+        "2022-01-01T10:00:00.000Z", "2022-01-01T10:00:00.000Z", None, "2022-01-02T08:30:00.000Z",
+    ]
+
+
+def test_strings_are_kept_when_a_value_is_not_a_timestamp():
+    # the sample only holds timestamps, the value after it does not parse
+    times = ["2022-01-01T10:00:00Z"] * compact.TIMESTAMP_SAMPLE + ["yesterday"]
+    out = compact.compact(pd.DataFrame({"time": times}))
+    assert out["time"].tolist() == times
+
+
+def test_localized_dates_are_left_as_they_are():
+    dates = ["Jan 5, 2023, 10:15:30 AM CET", "5 jan 2023, 10:15:30 CET"]
+    out = compact.compact(pd.DataFrame({"Date": dates}))
+    assert out["Date"].tolist() == dates
+
+
+def test_repeated_strings_become_categorical():
+    frame = pd.DataFrame(
+        {
+            "channel": ["a", "b", "a", "a", None, "b"],
+            "title": ["1", "2", "3", "4", "5", "6"],
+            "subtitles": [[{"name": "a"}]] * 6,
+            "views": [1, 1, 1, 1, 1, 1],
+        },
+        index=[5, 4, 3, 2, 1, 0],
+    )
+    out = compact.compact(frame)
+    assert isinstance(out["channel"].dtype, pd.CategoricalDtype)
+    assert out["channel"].tolist()[:4] == ["a", "b", "a", "a"]
+    assert pd.isna(out["channel"][4])
+    assert not isinstance(out["title"].dtype, pd.CategoricalDtype)
+    assert out["subtitles"].tolist() == frame["subtitles"].tolist()
+    assert out["views"].dtype == frame["views"].dtype
+    assert isinstance(out.index, pd.RangeIndex)
+    # the donated records are the same
+    assert out.to_json(orient="records") == frame.reset_index(drop=True).to_json(orient="records")
+
+
+def test_lazy_tables_are_compacted_when_built():
+    frame = pd.DataFrame({"channel": ["a"] * 10})
+    table = LazyTable(lambda: frame, frame.head(2), 10)
+    result = {"views": {"data": table}, "subscriptions": {"data": frame}}
+    compact.compact_result("YouTube", result)
+    assert isinstance(result["subscriptions"]["data"]["channel"].dtype, pd.CategoricalDtype)
+    assert isinstance(table.preview["channel"].dtype, pd.CategoricalDtype)
+    assert not table.is_built()
+    assert isinstance(table.frame()["channel"].dtype, pd.CategoricalDtype)
@@ -0,0 +1,62 @@
+import json
+
+import pandas as pd
+
+import port.api.props as props
+from port import consent
+from port.consent import TablePager
+
+
+def consent_form(rows=20, page_size=None):
+    frame = pd.DataFrame({"Title": [f"video {i}" for i in range(rows)], "Views": list(range(rows))})
+    table = props.PropsUIPromptConsentFormTable("YouTube_views", "Views", frame, page_size)
+    other = props.PropsUIPromptConsentFormTable("YouTube_other", "Other", frame.head(2))
+    return props.PropsUIPromptConsentForm([table, other], [])
+
+
+def test_deleted_rows_are_left_out():
+    pager = TablePager(consent_form())
+    answer = [{"YouTube_views": {"deleted": [0, 2, 99]}}, {"YouTube_other": {"deleted": []}}, {"user_omissions": "[]"}]
+    donated = json.loads(pager.resolve(json.dumps(answer)))
+    views = donated[0]["YouTube_views"]
+    assert len(views) == 18
+    assert [row["Views"] for row in views[:2]] == [1, 3]
+    assert donated[1]["YouTube_other"] == [{"Title": "video 0", "Views": 0}, {"Title": "video 1", "Views": 1}]
+    assert donated[2] == {"user_omissions": "[]"}
+
+
+def test_pages_and_search():
+    pager = TablePager(consent_form(page_size=7))
+    request = {"id": "YouTube_views", "page": 1, "query": [], "deleted": [0]}
+    page = pager.page(json.dumps(request)).toDict()
+    assert page["page"] == 1
+    assert page["matchCount"] == 19
+
+    request = {"id": "YouTube_views", "page": 5, "query": ["video 1"], "deleted": [10]}
+    page = pager.page(json.dumps(request)).toDict()
+    # video 1 and video 11 to 19, the last page of two
+    assert page["matchCount"] == 10
+    assert page["page"] == 1
+
+
+def test_sampled_tables_are_listed_in_the_donation():
+    pager = TablePager(consent_form(), sampled=["YouTube_views"])
+    donated = json.loads(pager.resolve(json.dumps([{"YouTube_views": {"deleted": []}}])))
+    assert donated[-1] == {"sampled": ["YouTube_views"]}
+
+    # only when the sampled table is donated
+    donated = json.loads(pager.resolve(json.dumps([{"YouTube_other": {"deleted": []}}])))
+    assert all("sampled" not in entry for entry in donated)
+
+
+def test_records_are_spliced_a_chunk_at_a_time(monkeypatch):
+    monkeypatch.setattr(consent, "RECORDS_CHUNK", 3)
+    pager = TablePager(consent_form(rows=10))
+    consent_json = json.dumps([{"YouTube_views": {"deleted": [4]}}, {"YouTube_other": [{"Title": "ü"}]}])
+
+    fragments = list(pager.fragments(consent_json))
+    donated = json.loads("".join(fragments))
+    assert [row["Views"] for row in donated[0]["YouTube_views"]] == [0, 1, 2, 3, 5, 6, 7, 8, 9]
+    assert donated[1] == {"YouTube_other": [{"Title": "ü"}]}
+    # no fragment holds more than a chunk of rows
+    assert max(fragment.count("Views") for fragment in fragments) == 3
@@ -0,0 +1,52 @@
+import base64
+import gzip
+import hashlib
+import json
+
+from port import donation
+
+
+def run(generator):
+    """Commands of a donation and the size it returns"""
+    commands = []
+    while True:
+        try:
+            commands.append(next(generator).toDict())
+        except StopIteration as stop:
+            return commands, stop.value
+
+
+def test_small_payload_is_donated_as_it_is():
+    commands, size = run(donation.donate("YouTube", ["[", '{"a": 1}', "]"]))
+    assert commands == [{"__type__": "CommandSystemDonate", "key": "YouTube", "json_string": '[{"a": 1}]'}]
+    assert size == 10
+
+
+def test_chunk_size_counts_utf8_bytes():
+    # 600 characters, 1200 bytes
+    data = json.dumps("é" * 600, ensure_ascii=False)
+    commands, size = run(donation.donate("YouTube", data, chunk_size=1000))
+    assert size == len(data.encode("utf-8"))
+    assert commands[-1]["key"] == "YouTube/manifest"
+
+
+def test_parts_and_manifest():
+    fragments = [json.dumps({"row": i, "text": "ü" * (i % 50)}) for i in range(2000)]
+    data = "".join(fragments)
+    commands, size = run(donation.donate("YouTube", iter(fragments), chunk_size=4096))
+
+    *parts, manifest = [json.loads(command["json_string"]) for command in commands]
+    assert [command["key"] for command in commands[:-1]] == [f"YouTube/part-{seq}" for seq in range(len(parts))]
+    assert len(parts) > 1
+
+    chunks = [base64.b64decode(part["data"]) for part in parts]
+    assert all(len(chunk) <= 4096 for chunk in chunks)
+    assert [part["sha256"] for part in parts] == [hashlib.sha256(chunk).hexdigest() for chunk in chunks]
+    assert [entry["seq"] for entry in manifest["parts"]] == list(range(len(parts)))
+    assert [entry["size"] for entry in manifest["parts"]] == [len(chunk) for chunk in chunks]
+    assert [entry["sha256"] for entry in manifest["parts"]] == [part["sha256"] for part in parts]
+
+    raw = gzip.decompress(b"".join(chunks))
+    assert raw.decode("utf-8") == data
+    assert manifest["size"] == size == len(raw)
+    assert manifest["sha256"] == hashlib.sha256(raw).hexdigest()
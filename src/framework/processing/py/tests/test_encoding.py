@@ -0,0 +1,60 @@
+import json
+
+import pandas as pd
+import pytest
+
+from port import encoding
+
+FRAME = pd.DataFrame(
+    {
+        "Channel": ["a", "b", "a", None, "a", "b"],
+        "Views": [1, 2, 3, 4, 5, 6],
+        "Kind": pd.Categorical(["x", None, "x", "y", "x", "x"]),
+        "Time": pd.to_datetime(["2022-01-01T10:00:00Z", None] * 3, utc=True),
+        "Subtitles": [[{"name": "a"}], None] * 3,
+    },
+    index=[10, 11, 12, 13, 14, 15],
+)
+
+
+def decode_columnar(text):
+    """Rows of a columnar table as consent_form.tsx decodes them, see src/framework/encoding.ts"""
+    table = json.loads(text)
+    columns = {}
+    for column in table["columns"]:
+        if "values" in column:
+            columns[column["name"]] = column["values"]
+        else:
+            columns[column["name"]] = [None if code == -1 else column["dictionary"][code] for code in column["codes"]]
+    return table["index"], [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def test_columnar_rows_are_the_donated_records():
+    index, rows = decode_columnar(encoding.encode(FRAME, "columnar"))
+    assert index == [10, 11, 12, 13, 14, 15]
+    # the consent form shows the values as they are donated, time zone aware timestamps included
+    assert rows == json.loads(FRAME.to_json(orient="records", date_format="iso"))
+    assert rows[0]["Time"] == "2022-01-01T10:00:00.000Z"
+
+
+def test_repeated_strings_and_categoricals_are_dictionary_encoded():
+    columns = {column["name"]: column for column in json.loads(encoding.encode(FRAME, "columnar"))["columns"]}
+    assert columns["Channel"]["dictionary"] == ["a", "b"]
+    assert columns["Channel"]["codes"] == [0, 1, 0, -1, 0, 1]
+    assert columns["Kind"]["dictionary"] == ["x", "y"]
+    assert columns["Kind"]["codes"] == [0, -1, 0, 1, 0, 0]
+    # distinct values and unhashable cells are sent as they are
+    assert columns["Views"]["values"] == [1, 2, 3, 4, 5, 6]
+    assert columns["Subtitles"]["values"][:2] == [[{"name": "a"}], None]
+
+
+def test_empty_table():
+    index, rows = decode_columnar(encoding.encode(FRAME.iloc[:0], "columnar"))
+    assert index == []
+    assert rows == []
+
+
+def test_json_encoding():
+    assert json.loads(encoding.encode(FRAME[["Channel"]].iloc[:2], "json")) == {"Channel": {"10": "a", "11": "b"}}
+    with pytest.raises(ValueError):
+        encoding.encode(FRAME, "arrow")
@@ -0,0 +1,44 @@
+import pytest
+
+import port.api.props as props
+from port import main
+from port.api.commands import CommandSystemDonate, CommandUIRender
+
+
+def script(answers):
+    """Script that donates around its renders and records what it is answered"""
+    answers.append((yield CommandSystemDonate("tracking", "[1]")))
+    answers.append((yield CommandSystemDonate("YouTube", "[2]")))
+    answers.append((yield CommandUIRender(props.PropsUIPageEnd())))
+    answers.append((yield CommandSystemDonate("tracking", "[3]")))
+
+
+def test_system_commands_are_sent_with_the_next_ui_command():
+    answers = []
+    wrapper = main.ScriptWrapper(script(answers))
+
+    batch = wrapper.send(None)
+    assert batch["__type__"] == "CommandBatch"
+    assert [command["__type__"] for command in batch["commands"]] == [
+        "CommandSystemDonate",
+        "CommandSystemDonate",
+        "CommandUIRender",
+    ]
+
+    # the commands after the last render are sent before the end
+    assert wrapper.send("rendered") == {"__type__": "CommandSystemDonate", "key": "tracking", "json_string": "[3]"}
+    assert answers == [None, None, "rendered", None]
+
+    with pytest.raises(StopIteration):
+        wrapper.send(None)
+
+
+def test_large_donations_are_not_held_back(monkeypatch):
+    monkeypatch.setattr(main, "MAX_BATCH_SIZE", 3)
+    wrapper = main.ScriptWrapper(script([]))
+
+    first = wrapper.send(None)
+    assert first == {"__type__": "CommandSystemDonate", "key": "tracking", "json_string": "[1]"}
+    second = wrapper.send(None)
+    assert second["key"] == "YouTube"
+    assert wrapper.send(None)["__type__"] == "CommandUIRender"
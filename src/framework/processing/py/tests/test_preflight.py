@@ -0,0 +1,28 @@
+from port import preflight
+from port.zipindex import MAX_READ_SIZE
+
+
+class Sizes:
+    """DDP with the given member sizes, see ZipIndex.size"""
+
+    def __init__(self, sizes):
+        self.sizes = sizes
+
+    def size(self, name):
+        return self.sizes[name]
+
+
+def test_members_are_extracted_in_full_unless_they_are_too_large():
+    assert preflight.mode(MAX_READ_SIZE, streamable=False) == preflight.FULL
+    assert preflight.mode(MAX_READ_SIZE + 1, streamable=False) == preflight.SKIPPED
+    # a streamed member is not read into memory at once, it can be larger
+    assert preflight.mode(MAX_READ_SIZE + 1, streamable=True) == preflight.FULL
+    assert preflight.mode(preflight.MAX_STREAMING_SIZE + 1, streamable=True) == preflight.SAMPLED
+
+
+def test_plan():
+    ddp = Sizes({"small.csv": 10, "large.json": preflight.MAX_STREAMING_SIZE + 1, "large.html": MAX_READ_SIZE + 1})
+    modes = preflight.plan(ddp, "YouTube", {"small.csv": False, "large.json": True, "large.html": False})
+    assert modes == {"small.csv": preflight.FULL, "large.json": preflight.SAMPLED, "large.html": preflight.SKIPPED}
+    assert preflight.max_rows(modes["small.csv"]) is None
+    assert preflight.max_rows(modes["large.json"]) == preflight.SAMPLE_ROWS
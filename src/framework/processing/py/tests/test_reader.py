@@ -0,0 +1,79 @@
+import io
+import zipfile
+
+import pytest
+
+from port import reader
+from port.reader import BlockReader
+from port.zipindex import ZipIndex
+
+MEMBERS = {
+    "Takeout/YouTube/history/watch-history.json": b"[" + b",".join(b'{"n": %d}' % i for i in range(50000)) + b"]",
+    "Takeout/YouTube/subscriptions/subscriptions.csv": b"Channel Id,Channel Url,Channel Title\n1,u,a\n",
+    # a second match on the file name is ignored
+    "Takeout/Other/subscriptions.csv": b"other",
+}
+
+
+@pytest.fixture
+def zip_bytes():
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, member in MEMBERS.items():
+            zip_file.writestr(name, member)
+    return data.getvalue()
+
+
+class Blocks:
+    """readBlock of an upload, see py_worker.js, that records the blocks read"""
+
+    def __init__(self, data):
+        self.data = data
+        self.reads = []
+
+    def readBlock(self, offset, size):
+        self.reads.append((offset, size))
+        return self.data[offset:offset + size]
+
+
+def test_fingerprint_is_the_same_for_every_source(zip_bytes, tmp_path):
+    path = tmp_path / "ddp.zip"
+    path.write_bytes(zip_bytes)
+    blocks = BlockReader(Blocks(zip_bytes).readBlock, len(zip_bytes), "ddp.zip")
+    fingerprints = {ZipIndex(source).fingerprint() for source in (zip_bytes, str(path), blocks)}
+    assert len(fingerprints) == 1
+
+    other = io.BytesIO()
+    with zipfile.ZipFile(other, "w") as zip_file:
+        zip_file.writestr("subscriptions.csv", b"changed")
+    assert ZipIndex(other.getvalue()).fingerprint() not in fingerprints
+
+
+def test_block_reader_reads_in_blocks(zip_bytes, monkeypatch):
+    monkeypatch.setattr(reader, "BLOCK_SIZE", 4096)
+    blocks = Blocks(zip_bytes)
+    upload = BlockReader(blocks.readBlock, len(zip_bytes), "ddp.zip")
+
+    with ZipIndex(upload) as ddp:
+        assert ddp.archive_size() == len(zip_bytes)
+        assert ddp.open("watch-history.json").read() == MEMBERS["Takeout/YouTube/history/watch-history.json"]
+
+    # the upload is read in blocks, never as a whole
+    assert max(size for _, size in blocks.reads) <= 4096
+    assert sum(size for _, size in blocks.reads) < 3 * len(zip_bytes)
+
+
+def test_block_reader_is_a_seekable_file():
+    data = bytes(range(256)) * 100
+    upload = BlockReader(Blocks(data).readBlock, len(data))
+    assert upload.read(10) == data[:10]
+    upload.seek(-5, io.SEEK_END)
+    assert upload.read() == data[-5:]
+    upload.seek(1000)
+    assert upload.read(3000) == data[1000:4000]
+    assert upload.tell() == 4000
+
+    upload.close()
+    assert upload.read_block is None
+    with pytest.raises(ValueError):
+        upload.read(1)
@@ -0,0 +1,104 @@
+import hashlib
+
+import pandas as pd
+
+from port import aggregate
+from port import redact
+from port.compact import compact
+from port.lazy import LazyTable
+
+SUBSCRIPTIONS = [
+    ("UC0000000000000000000001", "http://www.youtube.com/channel/UC0000000000000000000001", "Channel @one"),
+    ("UC0000000000000000000002", "http://www.youtube.com/channel/UC0000000000000000000002", "Two"),
+]
+
+
+def views():
+    return pd.DataFrame({"Channel": ["Fan @club", "Fan @club"], "Date": ["2022-12-30", "2022-12-31"]})
+
+
+def subscriptions(columns):
+    return pd.DataFrame(SUBSCRIPTIONS, columns=columns)
+
+
+def test_text_is_redacted():
+    values = pd.Series([
+        "mail me at fan@example.com",
+        "call +31 6 12345678",
+        "see https://youtu.be/x?t=1",
+        "thanks @creator",
+        "watched 2022 - 2023",
+    ])
+    out = redact.redact_text(values)
+    assert out[0] == "mail me at [email]"
+    assert out[1] == "call [phone]"
+    assert out[2] == f"see [url:{redact.pseudonym('https://youtu.be/x?t=1')}]"
+    assert out[3] == f"thanks @{redact.pseudonym('@creator')}"
+    assert out[4] == "watched 2022 - 2023"
+
+
+def test_pseudonyms_are_keyed_and_stable():
+    value = "https://www.youtube.com/watch?v=00000000001"
+    assert redact.pseudonym(value) == redact.pseudonym(value)
+    assert len(redact.pseudonym(value)) == redact.PSEUDONYM_LENGTH
+    assert redact.pseudonym(value) not in hashlib.sha256(value.encode("utf-8")).hexdigest()
+    assert redact.pseudonym(value) != redact.pseudonym(value + "2")
+
+
+def test_english_and_dutch_subscriptions_are_redacted_the_same():
+    en = redact.redact(subscriptions(["Channel Id", "Channel Url", "Channel Title"]))
+    nl = redact.redact(subscriptions(["Kanaal-ID", "Kanaal-URL", "Kanaaltitel"]))
+    assert en.to_numpy().tolist() == nl.to_numpy().tolist()
+    assert en["Channel Id"].tolist() == [redact.pseudonym(row[0]) for row in SUBSCRIPTIONS]
+    assert en["Channel Url"].tolist() == [redact.pseudonym(row[1]) for row in SUBSCRIPTIONS]
+    assert en["Channel Title"].tolist() == [f"Channel @{redact.pseudonym('@one')}", "Two"]
+
+
+def test_compacted_columns_stay_categorical():
+    urls = ["http://a", "http://b", "http://a", "http://a"]
+    out = redact.redact(compact(pd.DataFrame({"Channel Url": urls})))
+    assert isinstance(out["Channel Url"].dtype, pd.CategoricalDtype)
+    assert out["Channel Url"].tolist() == [redact.pseudonym(url) for url in urls]
+
+
+def test_subtitles_of_the_json_watch_history_are_redacted():
+    url = "https://www.youtube.com/channel/UC0000000000000000000001"
+    frame = pd.DataFrame({
+        "title": ["Watched a video", "Bekeken een video"],
+        "titleUrl": ["https://www.youtube.com/watch?v=1", "https://www.youtube.com/watch?v=1"],
+        "subtitles": [[{"name": "Channel one", "url": url}], None],
+    })
+    out = redact.redact(frame)
+    assert out["subtitles"][0] == [{"name": "Channel one", "url": redact.pseudonym(url)}]
+    assert out["subtitles"][1] is None
+    assert out["titleUrl"][0] == out["titleUrl"][1] == redact.pseudonym("https://www.youtube.com/watch?v=1")
+    # the input is left as it is
+    assert frame["subtitles"][0][0]["url"] == url
+
+
+def test_handles_that_look_like_pseudonyms_are_redacted():
+    out = redact.redact_text(pd.Series(["by @deadbeefcafebabe"]))
+    assert out[0] == f"by @{redact.pseudonym('@deadbeefcafebabe')}"
+
+
+def test_equal_lists_of_records_are_redacted_once():
+    url = "https://www.youtube.com/channel/UC0000000000000000000001"
+    values = pd.Series([[{"name": "one", "url": url}], None, [{"name": "one", "url": url}], []], index=[3, 2, 1, 0])
+    out = redact.redact_records(values)
+    assert out.index.tolist() == [3, 2, 1, 0]
+    record = {"name": "one", "url": redact.pseudonym(url)}
+    assert out.tolist() == [[record], None, [record], []]
+    assert out[3] is out[1]
+
+
+def test_aggregates_are_redacted_once():
+    # the aggregates are computed from the views before the result is redacted, see port.aggregate.of_table
+    history = LazyTable(lambda: views(), views(), 2)
+    result = {
+        "watch_history": {"data": history},
+        "watch_history_per_channel": {"data": aggregate.views_per_channel(history.frame())},
+    }
+    redact.redact_result("YouTube", result)
+    channel = f"Fan @{redact.pseudonym('@club')}"
+    assert result["watch_history_per_channel"]["data"]["Channel"].tolist() == [channel]
+    assert history.frame()["Channel"].tolist() == [channel, channel]
@@ -0,0 +1,173 @@
+import json
+import sys
+import zipfile
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import port.api.props as props
+from port import script
+from port.cache import ResultCache, result_size
+from port.lazy import LazyTable
+from port.platforms import Platform
+
+
+def payload(type, value=None):
+    return SimpleNamespace(__type__=type, value=value)
+
+
+# DDPs extracted by the platform under test, the DDP is invalid when VALID is False
+EXTRACTED = []
+VALID = True
+
+
+def extract(ddp):
+    """Extract function of the platform under test, in two chunks"""
+    EXTRACTED.append(ddp)
+    yield 0.5
+    validation = SimpleNamespace(ddp_category="test" if VALID else None, status_code=SimpleNamespace(id=0))
+    return validation, {"views": {"data": pd.DataFrame({"Title": ["a", "b"]}), "title": "Views"}} if VALID else {}
+
+
+class Upload:
+    """File as py_worker.js hands it to the script, see port.reader"""
+
+    def __init__(self, path):
+        self.data = path.read_bytes()
+        self.name = path.name
+        self.size = len(self.data)
+
+    def readBlock(self, offset, size):
+        return self.data[offset:offset + size]
+
+
+@pytest.fixture
+def ddp_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys.modules[__name__], "EXTRACTED", [])
+    monkeypatch.setattr(script, "PLATFORMS", [Platform("Test", __name__)])
+    # every chunk is followed by a progress page
+    monkeypatch.setattr(script, "PROGRESS_INTERVAL", 0)
+    path = tmp_path / "ddp.zip"
+    with zipfile.ZipFile(path, "w") as zip_file:
+        zip_file.writestr("views.json", "[]")
+    return path
+
+
+def run(ddp_path, answer_progress):
+    """Drive process() as the UI would, returns the bodies rendered in order"""
+    flow = script.process("test")
+    bodies = []
+    response = None
+    while True:
+        try:
+            command = flow.send(response)
+        except StopIteration:
+            return bodies
+        response = payload("PayloadVoid")
+        if type(command).__name__ != "CommandUIRender" or getattr(command.page, "body", None) is None:
+            continue
+        body = type(command.page.body).__name__
+        bodies.append(body)
+        if body == "PropsUIPromptFileInput":
+            response = payload("PayloadString", str(ddp_path))
+        elif body == "PropsUIPromptProgress":
+            response = answer_progress()
+        elif body == "PropsUIPromptConsentForm":
+            response = payload("PayloadJSON", json.dumps([{"Test_views": {"deleted": []}}]))
+
+
+def test_progress_is_shown_until_the_extraction_is_done(ddp_path):
+    bodies = run(ddp_path, lambda: payload("PayloadVoid"))
+    assert bodies == ["PropsUIPromptFileInput", "PropsUIPromptProgress", "PropsUIPromptConsentForm"]
+
+
+def test_cancel_prompts_for_the_file_again_once(ddp_path):
+    answers = iter([payload("PayloadFalse"), payload("PayloadVoid")])
+    bodies = run(ddp_path, lambda: next(answers))
+    assert bodies.count("PropsUIPromptFileInput") == 2
+    assert bodies == [
+        "PropsUIPromptFileInput",
+        "PropsUIPromptProgress",
+        "PropsUIPromptFileInput",
+        "PropsUIPromptProgress",
+        "PropsUIPromptConsentForm",
+    ]
+
+
+def test_sampled_tables_are_marked_in_the_consent_form():
+    title = props.Translatable({"en": "Views", "nl": "Weergaven"})
+    frame = pd.DataFrame({"Title": ["a"]})
+    form, _ = script.prompt_consent("Test", {
+        "views": {"data": frame, "title": title, "sampled": True},
+        "comments": {"data": frame, "title": title, "sampled": False},
+    })
+    views, comments = form.tables
+    assert views.title.toDict("en") == "Views (only the first 100,000 rows, the file is too large to read in full)"
+    assert views.title.toDict("nl").startswith("Weergaven (alleen de eerste 100.000 rijen")
+    assert comments.title is title
+
+
+def retry_twice(uploads, monkeypatch):
+    """Drive process() with an invalid DDP that is retried once, returns its readers and whether they were closed"""
+    monkeypatch.setattr(sys.modules[__name__], "VALID", False)
+    readers = []
+
+    def file_source(file_result, original=script.file_source):
+        readers.append(original(file_result))
+        return readers[-1]
+
+    monkeypatch.setattr(script, "file_source", file_source)
+
+    # whether the readers are closed when the retry is confirmed
+    closed = []
+    flow = script.process("test")
+    retries = iter([payload("PayloadTrue"), payload("PayloadFalse")])
+    response = None
+    while True:
+        try:
+            command = flow.send(response)
+        except StopIteration:
+            break
+        response = payload("PayloadVoid")
+        body = type(getattr(getattr(command, "page", None), "body", None)).__name__
+        if body == "PropsUIPromptFileInput":
+            response = payload("PayloadFile", Upload(next(uploads)))
+        elif body == "PropsUIPromptConfirm":
+            closed.append([reader.closed for reader in readers])
+            response = next(retries)
+    return readers, closed
+
+
+def test_resubmitted_file_uses_the_cached_result_and_its_upload(ddp_path, monkeypatch):
+    readers, closed = retry_twice(iter([ddp_path, ddp_path]), monkeypatch)
+    assert len(EXTRACTED) == 1
+    # the second upload is a cache hit: its reader is closed at once, the cached result still reads from the first
+    assert closed == [[False], [False, True]]
+    # released with the platform
+    assert [reader.closed for reader in readers] == [True, True]
+
+
+def test_evicted_results_release_their_upload(ddp_path, tmp_path, monkeypatch):
+    other_path = tmp_path / "other.zip"
+    with zipfile.ZipFile(other_path, "w") as zip_file:
+        zip_file.writestr("views.json", "[1]")
+    # room for one result only
+    monkeypatch.setattr(script, "ResultCache", lambda: ResultCache(max_size=1))
+    monkeypatch.setattr(script, "result_size", lambda result: 1)
+
+    readers, closed = retry_twice(iter([ddp_path, other_path]), monkeypatch)
+    assert len(EXTRACTED) == 2
+    # the result of the first upload is evicted by that of the second
+    assert closed == [[False], [True, False]]
+    assert [reader.closed for reader in readers] == [True, True]
+
+
+def test_result_size_extrapolates_lazy_tables():
+    frame = pd.DataFrame({"Title": ["a"] * 1000})
+    preview = frame.head(100)
+    lazy = LazyTable(lambda: frame, preview, 1000)
+    size = result_size({"views": {"data": lazy}})
+    full_size = frame.memory_usage(index=True).sum()
+    assert full_size <= size < 1.2 * full_size
+    assert not lazy.is_built()
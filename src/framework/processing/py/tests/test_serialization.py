@@ -0,0 +1,100 @@
+import pandas as pd
+
+import port.api.props as props
+from port.api.commands import CommandBatch, CommandSystemDonate, CommandUIRender, CommandUITablePage
+
+TEXT = props.Translatable({"en": "Text", "nl": "Tekst"})
+TEXT_WIRE = {"translations": {"en": "Text", "nl": "Tekst"}}
+
+# A frame without repeated values, encoded the same in the json and columnar encodings
+FRAME = pd.DataFrame({"Title": ["a", "b"]})
+
+
+def test_props_are_sent_as_before():
+    # the wire format of the hand written toDict methods the UI was built against
+    assert props.PropsUIHeader(TEXT).toDict() == {"__type__": "PropsUIHeader", "title": TEXT_WIRE}
+    assert props.PropsUIFooter(0.5).toDict() == {"__type__": "PropsUIFooter", "progressPercentage": 0.5}
+    assert props.PropsUIPromptConfirm(TEXT, TEXT, TEXT).toDict() == {
+        "__type__": "PropsUIPromptConfirm", "text": TEXT_WIRE, "ok": TEXT_WIRE, "cancel": TEXT_WIRE,
+    }
+    assert props.PropsUIPromptFileInput(TEXT, "application/zip").toDict() == {
+        "__type__": "PropsUIPromptFileInput", "description": TEXT_WIRE, "extensions": "application/zip",
+    }
+    items = [{"id": 0, "value": "YouTube"}]
+    assert props.PropsUIPromptRadioInput(TEXT, TEXT, items).toDict() == {
+        "__type__": "PropsUIPromptRadioInput", "title": TEXT_WIRE, "description": TEXT_WIRE, "items": items,
+    }
+    assert props.PropsUIPageEnd().toDict() == {"__type__": "PropsUIPageEnd"}
+
+    header, body, footer = props.PropsUIHeader(TEXT), props.PropsUIPageEnd(), props.PropsUIFooter(1)
+    assert props.PropsUIPageDonation("YouTube", header, body, footer).toDict() == {
+        "__type__": "PropsUIPageDonation",
+        "platform": "YouTube",
+        "header": {"__type__": "PropsUIHeader", "title": TEXT_WIRE},
+        "body": {"__type__": "PropsUIPageEnd"},
+        "footer": {"__type__": "PropsUIFooter", "progressPercentage": 1},
+    }
+
+
+def test_consent_form_is_sent_as_before_with_its_encoding():
+    table = props.PropsUIPromptConsentFormTable("YouTube_views", TEXT, FRAME, encoding="json")
+    form = props.PropsUIPromptConsentForm([table], [])
+    assert form.toDict() == {
+        "__type__": "PropsUIPromptConsentForm",
+        "tables": [{
+            "__type__": "PropsUIPromptConsentFormTable",
+            "id": "YouTube_views",
+            "title": TEXT_WIRE,
+            "encoding": "json",
+            "data_frame": FRAME.to_json(),
+        }],
+        "metaTables": [],
+    }
+
+
+def test_progress_and_paged_tables():
+    assert props.PropsUIPromptProgress(TEXT, 50, TEXT).toDict("en") == {
+        "__type__": "PropsUIPromptProgress", "description": "Text", "percentage": 50, "cancel": "Text",
+    }
+    table = props.PropsUIPromptConsentFormTable("views", TEXT, FRAME, page_size=1, encoding="json", row_count=10)
+    wire = table.toDict()
+    assert wire["rowCount"] == 10
+    assert wire["pageSize"] == 1
+    assert wire["data_frame"] == FRAME.iloc[:1].to_json()
+
+
+def test_commands_are_sent_as_before():
+    # json_string keeps its name on the wire, see __wire_names__
+    donate = CommandSystemDonate("key", "[]")
+    assert donate.toDict() == {"__type__": "CommandSystemDonate", "key": "key", "json_string": "[]"}
+    render = CommandUIRender(props.PropsUIPageEnd())
+    assert render.toDict() == {"__type__": "CommandUIRender", "page": {"__type__": "PropsUIPageEnd"}}
+    assert CommandBatch([donate, render]).toDict() == {
+        "__type__": "CommandBatch", "commands": [donate.toDict(), render.toDict()],
+    }
+    assert CommandUITablePage("views", 2, 10, FRAME, encoding="json").toDict() == {
+        "__type__": "CommandUITablePage", "id": "views", "page": 2, "matchCount": 10, "encoding": "json",
+        "data_frame": FRAME.to_json(),
+    }
+
+
+def test_translatables_are_resolved_per_locale():
+    assert TEXT.toDict("en") == "Text"
+    assert TEXT.toDict("nl") == "Tekst"
+    # unknown locales fall back to Dutch, as translator.ts does
+    assert TEXT.toDict("de") == "Tekst"
+    assert props.Translatable({"en": "Only English"}).toDict("nl") == "Only English"
+    assert props.PropsUIHeader(TEXT).toDict("en") == {"__type__": "PropsUIHeader", "title": "Text"}
+
+
+def test_immutables_are_serialized_once_per_locale():
+    header = props.PropsUIHeader(TEXT)
+    assert header.toDict("en") is header.toDict("en")
+    assert header.toDict("nl") is not header.toDict("en")
+    assert header.toDict() == {"__type__": "PropsUIHeader", "title": TEXT_WIRE}
+    # other props are serialized again, they can change between renders
+    footer = props.PropsUIFooter(0.5)
+    first = footer.toDict()
+    footer.progress_percentage = 0.75
+    assert first is not footer.toDict()
+    assert footer.toDict()["progressPercentage"] == 0.75
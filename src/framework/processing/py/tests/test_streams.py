@@ -0,0 +1,137 @@
+import io
+import json
+import zlib
+
+import pandas as pd
+import pytest
+
+from port import htmlstream
+from port import jsonstream
+
+WATCH_HISTORY = [
+    {"title": "Watched 日本語の動画 é", "titleUrl": "https://www.youtube.com/watch?v=1", "time": "2022-01-01T10:00:00Z"},
+    {"title": "Watched a video", "titleUrl": "https://www.youtube.com/watch?v=2", "time": "2022-01-02T10:00:00Z"},
+    {"title": "Watched 12", "details": [1.5, -2e3, True, None], "time": "2022-01-03T10:00:00Z"},
+] * 400
+
+CELL = (
+    '<div class="outer-cell"><div class="content-cell mdl-cell mdl-typography--body-1">'
+    'Watched\xa0<a href="https://www.youtube.com/watch?v={i}">Video {i} ünïcode &amp; more</a><br>'
+    '<a href="https://www.youtube.com/channel/UC{i}">Channel {c}</a><br>Jan {d}, 2022, 10:00:00 AM CET</div>'
+    '<div class="content-cell mdl-cell mdl-typography--body-1 mdl-typography--text-right"></div></div>'
+)
+
+
+def document(elements):
+    return json.dumps(elements, ensure_ascii=False, indent=1).encode("utf-8")
+
+
+def html_page(rows):
+    cells = "".join(CELL.format(i=i, c=i % 7, d=i % 28 + 1) for i in range(rows))
+    return f'<html><body><div class="mdl-grid">{cells}</div></body></html>'.encode("utf-8")
+
+
+def test_array_elements_split_over_reads():
+    data = document(WATCH_HISTORY)
+    assert list(jsonstream.iter_array(io.BytesIO(data), read_size=7)) == WATCH_HISTORY
+    assert list(jsonstream.iter_array(io.BytesIO(b"\xef\xbb\xbf [ ] "))) == []
+
+
+def test_array_estimate_counts_bytes():
+    # half of the text is not ASCII, counting characters would over-estimate the rows
+    elements = [{"title": "Bekeken 動画動画動画動画動画動画動画動画動画動画", "n": i} for i in range(5000)]
+    data = document(elements)
+    preview, estimated_count = jsonstream.preview_array(io.BytesIO(data), len(data), 100)
+    assert len(preview) == 100
+    assert abs(estimated_count - len(elements)) / len(elements) < 0.05
+
+
+def test_numbers_split_over_reads():
+    data = b"[1e5, 2E-3, 1.5e+10, -0.5, true]"
+    for read_size in range(1, len(data)):
+        assert list(jsonstream.iter_array(io.BytesIO(data), read_size=read_size)) == json.loads(data)
+
+
+class CountingReader(io.BytesIO):
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def test_array_error_does_not_read_the_rest_of_the_document():
+    data = b'[{"a": 1}, {"a": x}, ' + document(WATCH_HISTORY * 10)[1:]
+    fileobj = CountingReader(data)
+    with pytest.raises(ValueError):
+        list(jsonstream.iter_array(fileobj, read_size=1024))
+    assert fileobj.bytes_read <= 1024
+
+
+def test_array_to_df_keeps_the_records_before_an_error():
+    # the eighth record is invalid, the chunks before it and the first record of its chunk are kept
+    data = document(WATCH_HISTORY[:7])[:-2] + b", oops]"
+    frame = jsonstream.array_to_df(io.BytesIO(data), pd.DataFrame, chunk_size=3)
+    assert frame["time"].tolist() == [record["time"] for record in WATCH_HISTORY[:7]]
+
+
+def test_array_preview_of_a_small_array_is_exact():
+    data = document(WATCH_HISTORY[:10])
+    preview, estimated_count = jsonstream.preview_array(io.BytesIO(data), len(data), 100)
+    assert preview == WATCH_HISTORY[:10]
+    assert estimated_count == 10
+
+
+def test_array_to_df_max_rows():
+    data = document(WATCH_HISTORY)
+    frame = jsonstream.array_to_df(io.BytesIO(data), pd.DataFrame, max_rows=5)
+    assert len(frame) == 5
+
+
+def test_watch_history_html():
+    data = html_page(50)
+    frame = htmlstream.to_df(io.BytesIO(data), htmlstream.WatchHistoryParser)
+    assert list(frame.columns) == ["Title", "Url", "Channel", "Date"]
+    assert len(frame) == 50
+    assert frame.iloc[3].tolist() == [
+        "Video 3 ünïcode & more",
+        "https://www.youtube.com/watch?v=3",
+        "Channel 3",
+        "Jan 4, 2022, 10:00:00 AM CET",
+    ]
+
+
+def test_watch_history_html_preview_estimate():
+    data = html_page(3000)
+    preview, estimated_count = htmlstream.preview(io.BytesIO(data), len(data), htmlstream.WatchHistoryParser, 100)
+    assert len(preview) == 100
+    assert abs(estimated_count - 3000) / 3000 < 0.1
+
+
+class CorruptReader(io.BytesIO):
+    """Member of which the compressed stream is corrupt after the first read"""
+
+    def read(self, size=-1):
+        if self.tell() > 0:
+            raise zlib.error("invalid stored block lengths")
+        return super().read(size)
+
+
+def test_watch_history_html_read_error_keeps_the_rows_before_it(monkeypatch):
+    monkeypatch.setattr(htmlstream, "READ_SIZE", 4096)
+    data = html_page(100)
+    frame = htmlstream.to_df(CorruptReader(data), htmlstream.WatchHistoryParser)
+    assert 0 < len(frame) < 100
+    assert frame["Title"][0] == "Video 0 ünïcode & more"
+
+
+def test_html_parser_errors_are_raised():
+    class BrokenParser(htmlstream.WatchHistoryParser):
+        def to_row(self, lines, links):
+            raise KeyError("bug")
+
+    with pytest.raises(KeyError):
+        htmlstream.to_df(io.BytesIO(html_page(3)), BrokenParser)
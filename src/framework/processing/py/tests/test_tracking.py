@@ -0,0 +1,83 @@
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from port import tracking
+
+
+@pytest.fixture
+def sink():
+    sink = tracking.LogSink(capacity=3)
+    sink.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    logger = logging.getLogger("test_tracking")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(sink)
+    yield sink
+    logger.removeHandler(sink)
+
+
+def log(*messages):
+    for message in messages:
+        logging.getLogger("test_tracking").info(message)
+
+
+def test_drain_returns_the_records_since_the_previous_drain(sink):
+    log("a", "b")
+    assert sink.drain() == [{"seq": 0, "message": "INFO a"}, {"seq": 1, "message": "INFO b"}]
+    assert sink.drain() == []
+    log("c")
+    assert sink.drain() == [{"seq": 2, "message": "INFO c"}]
+
+
+def test_dropped_records_leave_a_gap_in_the_sequence_numbers(sink):
+    log("a", "b", "c", "d", "e")
+    # the ring buffer holds three records, the oldest two are dropped
+    assert [record["seq"] for record in sink.drain()] == [2, 3, 4]
+    log("f")
+    assert [record["seq"] for record in sink.drain()] == [5]
+
+
+def test_spans_are_donated_as_structured_records(sink, monkeypatch):
+    monkeypatch.setattr(tracking, "logger", logging.getLogger("test_tracking"))
+    with tracking.Span("extract", platform="YouTube") as span:
+        span.set(tables=2)
+    with pytest.raises(KeyError):
+        with tracking.Span("consent"):
+            raise KeyError("x")
+
+    extract, consent = sink.drain()
+    assert extract["message"].startswith("INFO Span extract took")
+    assert extract["span"]["name"] == "extract"
+    assert extract["span"]["platform"] == "YouTube"
+    assert extract["span"]["tables"] == 2
+    assert extract["span"]["seconds"] >= 0
+    assert consent["span"]["error"] == "KeyError"
+
+
+def test_cleanup_shows_the_memory_released(sink, monkeypatch):
+    monkeypatch.setattr(tracking, "logger", logging.getLogger("test_tracking"))
+    tables = [[str(i) * 10 for i in range(1000)] for _ in range(100)]
+    before = tracking.memory()
+    del tables
+    tracking.collect("cleanup", before, platform="YouTube")
+
+    (record,) = sink.drain()
+    span = record["span"]
+    assert span["platform"] == "YouTube"
+    assert span["allocated_blocks_after"] < span["allocated_blocks_before"] - 50000
+    assert set(span) >= {"heap_before", "heap_after", "unreachable"}
+    assert "heap_peak" not in span
+
+
+def test_cleanup_in_pyodide_reports_the_peak_of_the_webassembly_memory(sink, monkeypatch):
+    monkeypatch.setattr(tracking, "logger", logging.getLogger("test_tracking"))
+    heap = SimpleNamespace(length=64 * 1024 * 1024)
+    monkeypatch.setattr(tracking, "pyodide_js", SimpleNamespace(_module=SimpleNamespace(HEAPU8=heap)))
+    tracking.collect("cleanup")
+
+    span = sink.drain()[0]["span"]
+    # the WebAssembly memory never shrinks, it is not reported as the heap before and after
+    assert span["heap_before"] is None and span["heap_after"] is None
+    assert span["heap_peak"] == 64 * 1024 * 1024
+    assert span["allocated_blocks_before"] > 0
@@ -0,0 +1,49 @@
+import io
+import zipfile
+
+import pytest
+
+from port.zipindex import ZipIndex
+
+MEMBERS = {
+    "Takeout/YouTube/history/watch-history.json": b"[" + b",".join(b'{"n": %d}' % i for i in range(50000)) + b"]",
+    "Takeout/YouTube/subscriptions/subscriptions.csv": b"Channel Id,Channel Url,Channel Title\n1,u,a\n",
+    # a second match on the file name is ignored
+    "Takeout/Other/subscriptions.csv": b"other",
+}
+
+
+@pytest.fixture
+def zip_bytes():
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, member in MEMBERS.items():
+            zip_file.writestr(name, member)
+    return data.getvalue()
+
+
+def test_members_by_file_name(zip_bytes):
+    with ZipIndex(zip_bytes) as ddp:
+        assert ddp.is_zip()
+        assert sorted(ddp.names()) == ["subscriptions.csv", "watch-history.json"]
+        assert ddp.read("subscriptions.csv").read() == MEMBERS["Takeout/YouTube/subscriptions/subscriptions.csv"]
+        assert ddp.size("watch-history.json") == len(MEMBERS["Takeout/YouTube/history/watch-history.json"])
+        assert ddp.open("watch-history.json").read() == MEMBERS["Takeout/YouTube/history/watch-history.json"]
+        assert ddp.read("missing.json").read() == b""
+        assert ddp.open("missing.json") is None
+
+
+def test_reads_again_after_close(zip_bytes, tmp_path):
+    path = tmp_path / "ddp.zip"
+    path.write_bytes(zip_bytes)
+    ddp = ZipIndex(str(path))
+    ddp.close()
+    assert ddp.read("subscriptions.csv").read().startswith(b"Channel Id")
+    assert ddp.archive_size() == len(zip_bytes)
+
+
+def test_not_a_zip():
+    ddp = ZipIndex(b"not a zip")
+    assert not ddp.is_zip()
+    assert ddp.fingerprint() is None
+    assert ddp.names() == []
@@ -0,0 +1,184 @@
+"""
+Run the donation flow headless over a directory of DDPs
+
+Usage: python tools/run_batch.py DDP_DIR OUT_DIR [--workers 4] [--platform YouTube] [--locale en] [--blocks]
+
+Every zip in DDP_DIR is one session of port.script.process, driven through
+port.main.start as py_worker.js drives it, one batch of commands per run
+cycle, with scripted payloads as a participant would: the DDP is offered to
+every file prompt (or only to the prompts of --platform), progress is shown
+without cancelling, the consent form is accepted as is, and retry
+confirmations are declined. Sessions run in a process pool.
+
+Donations are written to OUT_DIR/<ddp>/<key>.json (<key>.<n>.json when a
+key is donated again), the timings of every session are appended to
+OUT_DIR/timings.jsonl and a summary is printed.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from types import SimpleNamespace
+
+# port is imported from the package root, also when the script is run as tools/run_batch.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def payload(type, value=None):
+    # py_worker.js hands the payloads to the script as objects with these attributes
+    return SimpleNamespace(__type__=type, value=value)
+
+
+class FileBlocks:
+    """File backed stand-in for the upload py_worker.js hands to the script in a PayloadFile"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = path.name
+        self.size = path.stat().st_size
+
+    def readBlock(self, offset, size):
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            return file.read(size)
+
+
+def accept_consent(consent_form):
+    """Consent as the UI sends it when the participant donates without deleting rows"""
+    consent = [{table["id"]: {"deleted": []}} for table in consent_form["tables"] + consent_form["metaTables"]]
+    consent.append({"user_omissions": "[]"})
+    return json.dumps(consent)
+
+
+def respond(command, ddp_path, platforms, blocks=False):
+    """Payload for the UI command of a run cycle (None when it only held system commands), and whether it ends"""
+    if command is None or command["__type__"] != "CommandUIRender":
+        return payload("PayloadVoid"), False
+
+    page = command["page"]
+    if page["__type__"] == "PropsUIPageEnd":
+        return None, True
+
+    body = page["body"]["__type__"]
+    if body == "PropsUIPromptFileInput":
+        if platforms is None or page["platform"] in platforms:
+            if blocks:
+                return payload("PayloadFile", FileBlocks(ddp_path)), False
+            return payload("PayloadString", str(ddp_path)), False
+        return payload("PayloadFalse", False), False
+    if body == "PropsUIPromptProgress":
+        # shown, not cancelled
+        return payload("PayloadVoid"), False
+    if body == "PropsUIPromptConsentForm":
+        return payload("PayloadJSON", accept_consent(page["body"])), False
+    return payload("PayloadFalse", False), False
+
+
+def run_session(ddp_path, out_dir, platforms=None, locale=None, blocks=False):
+    """Drive one session over ddp_path and write its donations, returns the timings of the session"""
+    session_id = re.sub(r"[^\w.-]", "_", ddp_path.stem)
+    session_dir = out_dir / session_id
+    timing = {
+        "ddp": ddp_path.name,
+        "ddp_bytes": ddp_path.stat().st_size,
+        "cycles": 0,
+        "commands": 0,
+        "rendered_bytes": 0,
+        "donations": 0,
+        "donated_bytes": 0,
+        "script_seconds": 0.0,
+        "error": None,
+    }
+
+    keys = {}
+    start = time.perf_counter()
+    script = None
+    response = None
+    try:
+        # imported in the session, an error fails the session instead of the batch
+        from port import main
+
+        script = main.start(session_id, locale)
+        while True:
+            step = time.perf_counter()
+            try:
+                wire = script.send(response)
+            except StopIteration:
+                break
+            timing["script_seconds"] += time.perf_counter() - step
+            timing["cycles"] += 1
+
+            commands = wire["commands"] if wire["__type__"] == "CommandBatch" else [wire]
+            command = None
+            for item in commands:
+                timing["commands"] += 1
+                if item["__type__"] == "CommandSystemDonate":
+                    data = item["json_string"]
+                    key = item["key"]
+                    # the tracking key is donated again at every step, every donation is kept
+                    seq = keys[key] = keys.get(key, -1) + 1
+                    path = session_dir / (f"{key}.json" if seq == 0 else f"{key}.{seq}.json")
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(data, encoding="utf-8")
+                    timing["donations"] += 1
+                    timing["donated_bytes"] += len(data)
+                else:
+                    timing["rendered_bytes"] += len(json.dumps(item))
+                    command = item
+
+            response, done = respond(command, ddp_path, platforms, blocks)
+            if done:
+                break
+    except Exception:
+        timing["error"] = traceback.format_exc()
+    finally:
+        if script is not None:
+            script.close()
+
+    timing["seconds"] = time.perf_counter() - start
+    return timing
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("ddp_dir", type=Path)
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--platform", action="append", dest="platforms", help="only offer the DDPs to this platform")
+    parser.add_argument("--locale", default=None, help="resolve translations as the UI does for this locale")
+    parser.add_argument("--blocks", action="store_true", help="offer the DDPs read in blocks, as py_worker.js does")
+    args = parser.parse_args()
+
+    ddps = sorted(args.ddp_dir.glob("*.zip"))
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, \
+            open(args.out_dir / "timings.jsonl", "a", encoding="utf-8") as timings:
+        futures = {
+            pool.submit(run_session, ddp, args.out_dir, args.platforms, args.locale, args.blocks): ddp for ddp in ddps
+        }
+        for future in as_completed(futures):
+            try:
+                timing = future.result()
+            except Exception:
+                # the worker running the session failed, the other sessions go on
+                timing = {"ddp": futures[future].name, "error": traceback.format_exc()}
+            timings.write(json.dumps(timing) + "\n")
+            if timing["error"] is not None:
+                failed += 1
+                print(f"FAILED {timing['ddp']}\n{timing['error']}")
+    elapsed = time.perf_counter() - start
+
+    rate = len(ddps) / elapsed if elapsed else 0
+    print(f"{len(ddps)} sessions, {failed} failed, {elapsed:.1f} s, {rate:.2f} sessions/s")
+
+
+if __name__ == "__main__":
+    main()
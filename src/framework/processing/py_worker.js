@@ -43,7 +43,7 @@ function unwrap (response) {
   return new Promise((resolve) => {
     switch (response.payload.__type__) {
       case 'PayloadFile':
-        copyFileToPyFS(response.payload.value, resolve)
+        resolve({ __type__: 'PayloadFile', value: blockSource(response.payload.value) })
         break
 
       default:
@@ -52,19 +52,14 @@ function unwrap (response) {
   })
 }
 
-function copyFileToPyFS (file, resolve) {
-  const reader = file.stream().getReader()
-  const pyFile = self.pyodide.FS.open(file.name, 'w')
-
-  const writeToPyFS = ({ done, value }) => {
-    if (done) {
-      resolve({ __type__: 'PayloadString', value: file.name })
-    } else {
-      self.pyodide.FS.write(pyFile, value, 0, value.length)
-      reader.read().then(writeToPyFS)
-    }
+function blockSource (file) {
+  // The script reads the blocks of the file it needs, the file is not copied into the Pyodide file system
+  const reader = new FileReaderSync()
+  return {
+    name: file.name,
+    size: file.size,
+    readBlock: (offset, size) => new Uint8Array(reader.readAsArrayBuffer(file.slice(offset, offset + size)))
   }
-  reader.read().then(writeToPyFS)
 }
 
 function initialise () {
@@ -43,7 +43,8 @@ export type PayloadResolved =
   PayloadTrue |
   PayloadString |
   PayloadFile |
-  PayloadJSON
+  PayloadJSON |
+  PayloadTablePageRequest
 
 export interface PayloadVoid {
   __type__: 'PayloadVoid'
@@ -73,12 +74,30 @@ export function isPayloadJSON (arg: any): arg is PayloadJSON {
   return isInstanceOf<PayloadJSON>(arg, 'PayloadJSON', ['value'])
 }
 
+export interface PayloadTablePageRequest {
+  __type__: 'PayloadTablePageRequest'
+  value: string
+}
+export function isPayloadTablePageRequest (arg: any): arg is PayloadTablePageRequest {
+  return isInstanceOf<PayloadTablePageRequest>(arg, 'PayloadTablePageRequest', ['value'])
+}
+
 export type Command =
   CommandUI |
-  CommandSystem
+  CommandSystem |
+  CommandBatch
 
 export function isCommand (arg: any): arg is Command {
-  return isCommandUI(arg) || isCommandSystem(arg)
+  return isCommandUI(arg) || isCommandSystem(arg) || isCommandBatch(arg)
+}
+
+// System commands followed by at most one UI command, the response is that of the UI command
+export interface CommandBatch {
+  __type__: 'CommandBatch'
+  commands: Array<CommandUI | CommandSystem>
+}
+export function isCommandBatch (arg: any): arg is CommandBatch {
+  return isInstanceOf<CommandBatch>(arg, 'CommandBatch', ['commands'])
 }
 
 export type CommandSystem =
@@ -89,10 +108,11 @@ export function isCommandSystem (arg: any): arg is CommandSystem {
 }
 
 export type CommandUI =
-  CommandUIRender
+  CommandUIRender |
+  CommandUITablePage
 
 export function isCommandUI (arg: any): arg is CommandUI {
-  return isCommandUIRender(arg)
+  return isCommandUIRender(arg) || isCommandUITablePage(arg)
 }
 
 export interface CommandSystemDonate {
@@ -111,3 +131,15 @@ export interface CommandUIRender {
 export function isCommandUIRender (arg: any): arg is CommandUIRender {
   return isInstanceOf<CommandUIRender>(arg, 'CommandUIRender', ['page']) && isPropsUIPage(arg.page)
 }
+
+export interface CommandUITablePage {
+  __type__: 'CommandUITablePage'
+  id: string
+  page: number
+  matchCount: number
+  data_frame: any
+  encoding?: string
+}
+export function isCommandUITablePage (arg: any): arg is CommandUITablePage {
+  return isInstanceOf<CommandUITablePage>(arg, 'CommandUITablePage', ['id', 'page', 'matchCount', 'data_frame'])
+}
@@ -5,7 +5,8 @@ export type PropsUIPrompt =
   PropsUIPromptFileInput |
   PropsUIPromptRadioInput |
   PropsUIPromptConsentForm |
-  PropsUIPromptConfirm
+  PropsUIPromptConfirm |
+  PropsUIPromptProgress
 
 export function isPropsUIPrompt (arg: any): arg is PropsUIPrompt {
   return isPropsUIPromptFileInput(arg) ||
@@ -23,6 +24,16 @@ export function isPropsUIPromptConfirm (arg: any): arg is PropsUIPromptConfirm {
   return isInstanceOf<PropsUIPromptConfirm>(arg, 'PropsUIPromptConfirm', ['text', 'ok', 'cancel'])
 }
 
+export interface PropsUIPromptProgress {
+  __type__: 'PropsUIPromptProgress'
+  description: Text
+  percentage: number
+  cancel: Text
+}
+export function isPropsUIPromptProgress (arg: any): arg is PropsUIPromptProgress {
+  return isInstanceOf<PropsUIPromptProgress>(arg, 'PropsUIPromptProgress', ['description', 'percentage', 'cancel'])
+}
+
 export interface PropsUIPromptFileInput {
   __type__: 'PropsUIPromptFileInput'
   description: Text
@@ -56,6 +67,9 @@ export interface PropsUIPromptConsentFormTable {
   title: Text
   description: Text
   data_frame: any
+  encoding?: string
+  rowCount?: number
+  pageSize?: number
 }
 export function isPropsUIPromptConsentFormTable (arg: any): arg is PropsUIPromptConsentFormTable {
   return isInstanceOf<PropsUIPromptConsentFormTable>(arg, 'PropsUIPromptConsentFormTable', ['id', 'title', 'description', 'data_frame'])
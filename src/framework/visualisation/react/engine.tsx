@@ -1,6 +1,6 @@
 import * as ReactDOM from 'react-dom/client'
 import { VisualisationEngine } from '../../types/modules'
-import { Response, Payload, CommandUIRender } from '../../types/commands'
+import { Response, Payload, CommandUI, CommandUITablePage, isCommandUITablePage } from '../../types/commands'
 import { PropsUIPage } from '../../types/pages'
 import VisualisationFactory from './factory'
 import { Main } from './main'
@@ -11,6 +11,9 @@ export default class ReactEngine implements VisualisationEngine {
   locale!: string
   root!: ReactDOM.Root
 
+  resolvePending?: (payload: Payload) => void
+  tablePageListener?: (command: CommandUITablePage) => void
+
   constructor (factory: VisualisationFactory) {
     this.factory = factory
   }
@@ -21,23 +24,40 @@ export default class ReactEngine implements VisualisationEngine {
     this.locale = locale
   }
 
-  async render (command: CommandUIRender): Promise<Response> {
+  async render (command: CommandUI): Promise<Response> {
     return await new Promise<Response>((resolve) => {
-      this.renderPage(command.page).then(
-        (payload: Payload) => {
-          resolve({ __type__: 'Response', command, payload })
-        },
-        () => {}
-      )
+      this.resolvePending = (payload: Payload) => {
+        resolve({ __type__: 'Response', command, payload })
+      }
+
+      if (isCommandUITablePage(command)) {
+        this.renderTablePage(command)
+      } else {
+        this.renderPage(command.page)
+      }
     })
   }
 
-  async renderPage (props: PropsUIPage): Promise<any> {
-    return await new Promise<any>((resolve) => {
-      const context = { locale: this.locale, resolve }
-      const page = this.factory.createPage(props, context)
-      this.renderElements([page])
-    })
+  renderPage (props: PropsUIPage): void {
+    const context = {
+      locale: this.locale,
+      resolve: (payload: Payload) => this.resolve(payload),
+      onTablePage: (listener: (command: CommandUITablePage) => void) => { this.tablePageListener = listener }
+    }
+    this.tablePageListener = undefined
+    const page = this.factory.createPage(props, context)
+    this.renderElements([page])
+  }
+
+  renderTablePage (command: CommandUITablePage): void {
+    // The page that requested the table page is still mounted, it receives the rows and resolves the next response
+    this.tablePageListener?.(command)
+  }
+
+  resolve (payload: Payload): void {
+    const resolvePending = this.resolvePending
+    this.resolvePending = undefined
+    resolvePending?.(payload)
   }
 
   terminate (): void {}
@@ -2,12 +2,13 @@
 import { EndPage } from './ui/pages/end_page'
 import { isPropsUIPageEnd, isPropsUIPageDonation, PropsUIPage, isPropsUIPageSplashScreen } from '../../types/pages'
 import { DonationPage } from './ui/pages/donation_page'
-import { Payload } from '../../types/commands'
+import { CommandUITablePage, Payload } from '../../types/commands'
 import { SplashScreen } from './ui/pages/splash_screen'
 
 export interface ReactFactoryContext {
   locale: string
   resolve?: (payload: Payload) => void
+  onTablePage?: (listener: (command: CommandUITablePage) => void) => void
 }
 
 export default class ReactFactory {
@@ -17,6 +17,16 @@ type Props = Weak<PropsUITable> & TableContext & ReactFactoryContext
 
 export interface TableContext {
   onChange: (id: string, rows: PropsUITableRow[]) => void
+  remote?: TableRemote
+}
+
+// Table of which the rows live in the processing engine, only the current page is available
+export interface TableRemote {
+  page: number
+  matchCount: number
+  rowCount: number
+  rows: PropsUITableRow[]
+  onRequestPage: (id: string, page: number, query: string[], deleted: string[]) => void
 }
 
 interface Visibility {
@@ -40,12 +50,14 @@ interface State {
   visibility: Visibility
 }
 
-export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale, onChange }: Props): JSX.Element => {
+export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale, onChange, remote }: Props): JSX.Element => {
   const pageWindowLegSize = 3
 
   const query = React.useRef<string[]>([])
+  const deleted = React.useRef<string[]>([])
   const alteredRows = React.useRef<PropsUITableRow[]>(body.rows)
   const filteredRows = React.useRef<PropsUITableRow[]>(alteredRows.current)
+  const rowCount = remote !== undefined ? remote.rowCount : body.rows.length
 
   const initialState: State = {
     edit: false,
@@ -56,11 +68,11 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
     selected: [],
     deletedCount: 0,
     visibility: {
-      search: alteredRows.current.length > pageSize,
+      search: rowCount > pageSize,
       delete: false,
       undo: false,
-      table: filteredRows.current.length > 0,
-      noData: filteredRows.current.length === 0,
+      table: getMatchCount() > 0,
+      noData: getMatchCount() === 0,
       noDataLeft: false,
       noResults: false
     }
@@ -68,6 +80,12 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
 
   const [state, setState] = React.useState<State>(initialState)
 
+  React.useEffect(() => {
+    if (remote !== undefined) {
+      handleRemotePage(remote)
+    }
+  }, [remote?.rows])
+
   const copy = prepareCopy(locale)
 
   function display (element: keyof Visibility): string {
@@ -113,15 +131,22 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
     return range
   }
 
+  function getMatchCount (): number {
+    return remote !== undefined ? remote.matchCount : filteredRows.current.length
+  }
+
   function getPageCount (): number {
-    if (filteredRows.current.length === 0) {
+    if (getMatchCount() === 0) {
       return 0
     }
 
-    return Math.ceil(filteredRows.current.length / pageSize)
+    return Math.ceil(getMatchCount() / pageSize)
   }
 
   function updateRows (currentPage: number): PropsUITableRow[] {
+    if (remote !== undefined) {
+      return remote.rows
+    }
     const offset = currentPage * pageSize
     return filteredRows.current.slice(offset, offset + pageSize)
   }
@@ -261,7 +286,30 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
     })
   }
 
+  function requestPage (page: number): void {
+    remote?.onRequestPage(id, page, query.current, deleted.current)
+  }
+
+  function handleRemotePage ({ page, matchCount, rows }: TableRemote): void {
+    setState((state) => {
+      const pageCount = getPageCount()
+      const pageWindow = updatePageWindow(page)
+      const visibility = {
+        ...state.visibility,
+        table: matchCount > 0,
+        noData: rowCount === 0,
+        noDataLeft: rowCount > 0 && deleted.current.length === rowCount,
+        noResults: deleted.current.length < rowCount && matchCount === 0
+      }
+      return { ...state, page, pageCount, pageWindow, rows, visibility }
+    })
+  }
+
   function handlePrevious (): void {
+    if (remote !== undefined) {
+      requestPage(state.page === 0 ? state.pageCount - 1 : state.page - 1)
+      return
+    }
     setState((state) => {
       const page = state.page === 0 ? state.pageCount - 1 : state.page - 1
       const pageWindow = updatePageWindow(page)
@@ -271,6 +319,10 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
   }
 
   function handleNext (): void {
+    if (remote !== undefined) {
+      requestPage(state.page === state.pageCount - 1 ? 0 : state.page + 1)
+      return
+    }
     setState((state) => {
       const page = state.page === state.pageCount - 1 ? 0 : state.page + 1
       const pageWindow = updatePageWindow(page)
@@ -283,6 +335,16 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
     const currentSelectedRows = state.selected.slice(0)
     if (currentSelectedRows.length === 0) return
 
+    if (remote !== undefined) {
+      deleted.current = deleted.current.concat(currentSelectedRows)
+      setState((state) => {
+        const visibility = { ...state.visibility, undo: true }
+        return { ...state, deletedCount: deleted.current.length, selected: [], visibility }
+      })
+      requestPage(state.page)
+      return
+    }
+
     const newAlteredRows = alteredRows.current.slice(0)
 
     for (const rowId of currentSelectedRows) {
@@ -316,6 +378,16 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
   }
 
   function handleUndo (): void {
+    if (remote !== undefined) {
+      deleted.current = []
+      setState((state) => {
+        const visibility = { ...state.visibility, undo: false }
+        return { ...state, deletedCount: 0, selected: [], visibility }
+      })
+      requestPage(state.page)
+      return
+    }
+
     alteredRows.current = body.rows
     filteredRows.current = filterRows()
     setState((state) => {
@@ -340,6 +412,10 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
 
   function handleSearch (newQuery: string[]): void {
     query.current = newQuery
+    if (remote !== undefined) {
+      requestPage(0)
+      return
+    }
     filteredRows.current = filterRows()
     setState((state) => {
       const pageCount = getPageCount()
@@ -358,6 +434,10 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
   }
 
   function handleNewPage (page: number): void {
+    if (remote !== undefined) {
+      requestPage(page)
+      return
+    }
     setState((state) => {
       const rows = updateRows(page)
       return { ...state, page, rows }
@@ -378,7 +458,7 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
   return (
     <>
       <div className='flex flex-row gap-4 items-center'>
-        <div className={`flex flex-row items-center gap-2 mt-2 ${body.rows.length <= pageSize ? 'hidden' : ''} `}>
+        <div className={`flex flex-row items-center gap-2 mt-2 ${rowCount <= pageSize ? 'hidden' : ''} `}>
           <BackIconButton onClick={handlePrevious} />
           <div>
             {renderPageIcons()}
@@ -410,7 +490,7 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
       <div className={`flex flex-col justify-center items-center w-full h-table bg-grey6 ${display('noResults')}`}>
         <Title3 text={copy.noResults} color='text-grey3' margin='' />
       </div>
-      <div className={`flex flex-row items-center gap-6 mt-2 h-8 ${body.rows.length === 0 ? 'hidden' : ''} `}>
+      <div className={`flex flex-row items-center gap-6 mt-2 h-8 ${rowCount === 0 ? 'hidden' : ''} `}>
         <div className='flex flex-row gap-4 items-center'>
           <CheckBox id='edit' selected={state.edit} onSelect={handleEditToggle} />
           <Label text={copy.edit} margin='mt-1px' />
@@ -436,7 +516,7 @@ export const Table = ({ id, head, body, readOnly = false, pageSize = 7, locale,
       noResults: Translator.translate(noResultsLabel, locale),
       pages: Translator.translate(pagesLabel(state.pageCount), locale),
       delete: Translator.translate(deleteLabel, locale),
-      deleted: Translator.translate(deletedLabel(body.rows.length - alteredRows.current.length), locale),
+      deleted: Translator.translate(deletedLabel(remote !== undefined ? deleted.current.length : body.rows.length - alteredRows.current.length), locale),
       searchPlaceholder: Translator.translate(searchPlaceholder, locale),
       link: Translator.translate(link, locale)
     }
@@ -4,13 +4,14 @@ import TextBundle from '../../../../text_bundle'
 import { Translator } from '../../../../translator'
 import { Translatable } from '../../../../types/elements'
 import { PropsUIPageDonation } from '../../../../types/pages'
-import { isPropsUIPromptConfirm, isPropsUIPromptConsentForm, isPropsUIPromptFileInput } from '../../../../types/prompts'
+import { isPropsUIPromptConfirm, isPropsUIPromptConsentForm, isPropsUIPromptFileInput, isPropsUIPromptProgress } from '../../../../types/prompts'
 import { ReactFactoryContext } from '../../factory'
 import { ForwardButton } from '../elements/button'
 import { Title1 } from '../elements/text'
 import { Confirm } from '../prompts/confirm'
 import { ConsentForm } from '../prompts/consent_form'
 import { FileInput } from '../prompts/file_input'
+import { ProgressPrompt } from '../prompts/progress'
 import { Footer } from './templates/footer'
 import { Sidebar } from './templates/sidebar'
 import LogoSvg from '../../../../../assets/images/logo.svg'
@@ -25,7 +26,7 @@ export const DonationPage = (props: Props): JSX.Element => {
   const { platform, locale, resolve } = props
 
   function renderBody (props: Props): JSX.Element {
-    const context = { locale: locale, resolve: props.resolve }
+    const context = { locale: locale, resolve: props.resolve, onTablePage: props.onTablePage }
     const body = props.body
     if (isPropsUIPromptFileInput(body)) {
       return <FileInput {...body} {...context} />
@@ -36,6 +37,9 @@ export const DonationPage = (props: Props): JSX.Element => {
     if (isPropsUIPromptConsentForm(body)) {
       return <ConsentForm {...body} {...context} />
     }
+    if (isPropsUIPromptProgress(body)) {
+      return <ProgressPrompt {...body} {...context} />
+    }
     throw new TypeError('Unknown body type')
   }
 
@@ -1,66 +1,44 @@
-import { assert, Weak } from '../../../../helpers'
+import { Weak } from '../../../../helpers'
 import { PropsUITable, PropsUITableBody, PropsUITableCell, PropsUITableHead, PropsUITableRow } from '../../../../types/elements'
+import { parseDataFrame } from '../../../../encoding'
 import { PropsUIPromptConsentForm, PropsUIPromptConsentFormTable } from '../../../../types/prompts'
-import { Table } from '../elements/table'
+import { CommandUITablePage } from '../../../../types/commands'
+import { Table, TableRemote } from '../elements/table'
 import { LabelButton, PrimaryButton } from '../elements/button'
 import { BodyLarge, Title4 } from '../elements/text'
 import TextBundle from '../../../../text_bundle'
 import { Translator } from '../../../../translator'
 import { ReactFactoryContext } from '../../factory'
 import React from 'react'
-import _ from 'lodash'
 
 type Props = Weak<PropsUIPromptConsentForm> & ReactFactoryContext
 
 interface TableContext {
   title: string
   deletedRowCount: number
+  rowCount?: number
 }
 
+type TablePage = Pick<TableRemote, 'page' | 'matchCount' | 'rows'>
+
 export const ConsentForm = (props: Props): JSX.Element => {
   const tablesIn = React.useRef<Array<PropsUITable & TableContext>>(parseTables(props.tables))
   const metaTables = React.useRef<Array<PropsUITable & TableContext>>(parseTables(props.metaTables))
   const tablesOut = React.useRef<Array<PropsUITable & TableContext>>(tablesIn.current)
+  const deletedRows = React.useRef<Record<string, string[]>>({})
+  const [tablePages, setTablePages] = React.useState<Record<string, TablePage>>(initialTablePages)
 
   const { locale, resolve } = props
   const { description, donateQuestion, donateButton, cancelButton } = prepareCopy(props)
 
-  function rowCell (dataFrame: any, column: string, row: number): PropsUITableCell {
-    const text = String(dataFrame[column][`${row}`])
-    return { __type__: 'PropsUITableCell', text: text }
-  }
+  React.useEffect(() => {
+    props.onTablePage?.(handleTablePage)
+  }, [])
 
-  function headCell (dataFrame: any, column: string): PropsUITableCell {
+  function headCell (column: string): PropsUITableCell {
     return { __type__: 'PropsUITableCell', text: column }
   }
 
-  function columnNames (dataFrame: any): string[] {
-    return Object.keys(dataFrame)
-  }
-
-  function columnCount (dataFrame: any): number {
-    return columnNames(dataFrame).length
-  }
-
-  function rowCount (dataFrame: any): number {
-    if (columnCount(dataFrame) === 0) {
-      return 0
-    } else {
-      const firstColumn = dataFrame[columnNames(dataFrame)[0]]
-      return Object.keys(firstColumn).length - 1
-    }
-  }
-
-  function rows (data: any): PropsUITableRow[] {
-    const result: PropsUITableRow[] = []
-    for (let row = 0; row <= rowCount(data); row++) {
-      const id = `${row}`
-      const cells = columnNames(data).map((column: string) => rowCell(data, column, row))
-      result.push({ __type__: 'PropsUITableRow', id, cells })
-    }
-    return result
-  }
-
   function parseTables (tablesData: PropsUIPromptConsentFormTable[]): Array<PropsUITable & TableContext> {
     console.log('parseTables')
     return tablesData.map((table) => parseTable(table))
@@ -70,23 +48,51 @@ export const ConsentForm = (props: Props): JSX.Element => {
     const id = tableData.id
     const title = Translator.translate(tableData.title, props.locale)
     const deletedRowCount = 0
-    const dataFrame = JSON.parse(tableData.data_frame)
-    const headCells = columnNames(dataFrame).map((column: string) => headCell(dataFrame, column))
+    const dataFrame = parseDataFrame(tableData.data_frame, tableData.encoding)
+    const headCells = dataFrame.columns.map((column: string) => headCell(column))
     const head: PropsUITableHead = { __type__: 'PropsUITableHead', cells: headCells }
-    const body: PropsUITableBody = { __type__: 'PropsUITableBody', rows: rows(dataFrame) }
+    const body: PropsUITableBody = { __type__: 'PropsUITableBody', rows: dataFrame.rows }
+    const { rowCount, pageSize } = tableData
+
+    return { __type__: 'PropsUITable', id, head, body, title, deletedRowCount, rowCount, pageSize }
+  }
 
-    return { __type__: 'PropsUITable', id, head, body, title, deletedRowCount }
+  function initialTablePages (): Record<string, TablePage> {
+    const pages: Record<string, TablePage> = {}
+    tablesIn.current
+      .filter(({ rowCount }) => rowCount !== undefined)
+      .forEach(({ id, rowCount, body }) => { pages[id] = { page: 0, matchCount: rowCount ?? 0, rows: body.rows } })
+    return pages
+  }
+
+  function tableRemote ({ id, rowCount }: (Weak<PropsUITable> & TableContext)): TableRemote | undefined {
+    if (rowCount === undefined) {
+      return undefined
+    }
+    return { ...tablePages[id], rowCount, onRequestPage: handleRequestPage }
   }
 
   function renderTable (table: (Weak<PropsUITable> & TableContext), readOnly = false): JSX.Element {
     return (
       <div key={table.id} className='flex flex-col gap-4 mb-4'>
         <Title4 text={table.title} margin='' />
-        <Table {...table} readOnly={readOnly} locale={locale} onChange={handleTableChange} />
+        <Table {...table} readOnly={readOnly} locale={locale} onChange={handleTableChange} remote={tableRemote(table)} />
       </div>
     )
   }
 
+  function handleRequestPage (id: string, page: number, query: string[], deleted: string[]): void {
+    deletedRows.current[id] = deleted
+    tablesOut.current = tablesOut.current.map((table) => table.id === id ? { ...table, deletedRowCount: deleted.length } : table)
+    const value = JSON.stringify({ id, page, query, deleted })
+    resolve?.({ __type__: 'PayloadTablePageRequest', value })
+  }
+
+  function handleTablePage ({ id, page, matchCount, data_frame: dataFrame, encoding }: CommandUITablePage): void {
+    const tablePage = { page, matchCount, rows: parseDataFrame(dataFrame, encoding).rows }
+    setTablePages((tablePages) => { return { ...tablePages, [id]: tablePage } })
+  }
+
   function handleTableChange (id: string, rows: PropsUITableRow[]): void {
     const tablesCopy = tablesOut.current.slice(0)
     const index = tablesCopy.findIndex(table => table.id === id)
@@ -134,16 +140,18 @@ export const ConsentForm = (props: Props): JSX.Element => {
     return { user_omissions: data }
   }
 
-  function serializeTable ({ id, head, body: { rows } }: PropsUITable): any {
-    const data = rows.map((row) => serializeRow(row, head))
-    return { [id]: data }
+  function serializeTable ({ id, body: { rows }, rowCount }: PropsUITable & TableContext): any {
+    // The processing engine holds the rows of the tables, it only needs to know what was deleted
+    if (rowCount !== undefined) {
+      return { [id]: { deleted: deletedRows.current[id] ?? [] } }
+    }
+    return { [id]: { deleted: deletedRowIds(id, rows) } }
   }
 
-  function serializeRow (row: PropsUITableRow, head: PropsUITableHead): any {
-    assert(row.cells.length === head.cells.length, `Number of cells in row (${row.cells.length}) should be equals to number of cells in head (${head.cells.length})`)
-    const keys = head.cells.map((cell) => cell.text)
-    const values = row.cells.map((cell) => cell.text)
-    return _.fromPairs(_.zip(keys, values))
+  function deletedRowIds (id: string, rows: PropsUITableRow[]): string[] {
+    const remaining = new Set(rows.map((row) => row.id))
+    const table = tablesIn.current.concat(metaTables.current).find((table) => table.id === id)
+    return (table?.body.rows ?? []).map((row) => row.id).filter((rowId) => !remaining.has(rowId))
   }
 
   return (
@@ -0,0 +1,53 @@
+import React from 'react'
+import { Weak } from '../../../../helpers'
+import { ReactFactoryContext } from '../../factory'
+import { PropsUIPromptProgress } from '../../../../types/prompts'
+import { Translator } from '../../../../translator'
+import { BodyLarge } from '../elements/text'
+import { PrimaryButton } from '../elements/button'
+import { Progress } from '../elements/progress'
+
+type Props = Weak<PropsUIPromptProgress> & ReactFactoryContext
+
+export const ProgressPrompt = (props: Props): JSX.Element => {
+  const { resolve, percentage } = props
+  const { description, cancel } = prepareCopy(props)
+  const [cancelled, setCancelled] = React.useState<boolean>(false)
+  const cancelledRef = React.useRef<boolean>(false)
+
+  // The script works on the next chunk as soon as the progress is shown, a cancel is sent with the next update
+  React.useEffect(() => {
+    if (cancelledRef.current) {
+      resolve?.({ __type__: 'PayloadFalse', value: false })
+    } else {
+      resolve?.({ __type__: 'PayloadVoid', value: undefined })
+    }
+  }, [props])
+
+  function handleCancel (): void {
+    cancelledRef.current = true
+    setCancelled(true)
+  }
+
+  return (
+    <>
+      <BodyLarge text={description} margin='mb-4' />
+      <div className='mb-8'>
+        <Progress percentage={percentage} />
+      </div>
+      {cancelled ? null : <PrimaryButton label={cancel} onClick={handleCancel} color='text-grey1 bg-tertiary' />}
+    </>
+  )
+}
+
+interface Copy {
+  description: string
+  cancel: string
+}
+
+function prepareCopy ({ description, cancel, locale }: Props): Copy {
+  return {
+    description: Translator.translate(description, locale),
+    cancel: Translator.translate(cancel, locale)
+  }
+}
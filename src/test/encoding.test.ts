@@ -0,0 +1,38 @@
+import { parseDataFrame } from '../framework/encoding'
+
+// Encoded by port.encoding.encode, see tests/test_encoding.py
+const COLUMNAR = JSON.stringify({
+  index: [10, 11, 12, 13],
+  columns: [
+    { name: 'Channel', dictionary: ['a', 'b'], codes: [0, 1, -1, 0] },
+    { name: 'Views', values: [1, 2, 3, 4] },
+    { name: 'Time', values: ['2022-01-01T10:00:00.000Z', null, '2022-01-02T10:00:00.000Z', null] }
+  ]
+})
+
+function texts (encoded: string, encoding?: string): string[][] {
+  return parseDataFrame(encoded, encoding).rows.map((row) => row.cells.map((cell) => cell.text))
+}
+
+test('decodes columnar tables', () => {
+  const dataFrame = parseDataFrame(COLUMNAR, 'columnar')
+  expect(dataFrame.columns).toEqual(['Channel', 'Views', 'Time'])
+  expect(dataFrame.rows.map((row) => row.id)).toEqual(['10', '11', '12', '13'])
+  expect(texts(COLUMNAR, 'columnar')).toEqual([
+    ['a', '1', '2022-01-01T10:00:00.000Z'],
+    ['b', '2', 'null'],
+    ['null', '3', '2022-01-02T10:00:00.000Z'],
+    ['a', '4', 'null']
+  ])
+})
+
+test('decodes columnar tables without rows', () => {
+  const empty = JSON.stringify({ index: [], columns: [{ name: 'Channel', dictionary: [], codes: [] }] })
+  expect(parseDataFrame(empty, 'columnar')).toEqual({ columns: ['Channel'], rows: [] })
+})
+
+test('decodes json tables as columnar tables', () => {
+  const json = JSON.stringify({ Channel: { 10: 'a', 11: 'b', 12: null, 13: 'a' }, Views: { 10: 1, 11: 2, 12: 3, 13: 4 } })
+  expect(texts(json)).toEqual(texts(COLUMNAR, 'columnar').map((cells) => cells.slice(0, 2)))
+  expect(parseDataFrame(json).rows.map((row) => row.id)).toEqual(['10', '11', '12', '13'])
+})